@@ -9,6 +9,7 @@ from .vulnerability_scanners import (
 
 from .asset_discovery import AssetDiscovery
 from .report_generator import ReportGenerator
+from .api import ScanPipeline, scan_events, ascan_events
 
 __all__ = [
     'WordPressScanner',
@@ -16,5 +17,8 @@ __all__ = [
     'SMBScanner',
     'ZyxelScanner',
     'AssetDiscovery',
-    'ReportGenerator'
+    'ReportGenerator',
+    'ScanPipeline',
+    'scan_events',
+    'ascan_events'
 ]
\ No newline at end of file
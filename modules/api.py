@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة الواجهة البرمجية المتدفقة لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+
+مثال:
+    from modules.api import scan_events
+
+    for event in scan_events('192.168.1.0/24', threads=50):
+        if event.type == 'finding' and event.vulnerable:
+            print(event.check, event.host, event.details)
+"""
+
+import asyncio
+import json
+import queue
+import threading
+from contextlib import nullcontext
+
+from .asset_discovery import AssetDiscovery
+from .connection_pool import RateLimitedHTTP, http_pool
+from .output import console
+from .port_store import json_default
+from .profiler import tracer
+from .scan_service import ScanCancelled
+from .scheduler import ScanBudget
+from .vulnerability_scanners import CraftCMSScanner, SMBScanner, WordPressScanner, ZyxelScanner
+from .web_dedup import scan_deduplicated
+
+# نهاية تدفق الأحداث
+_END = object()
+
+
+class ScanPipeline:
+    """مراحل الفحص الكاملة دون عرض التقارير، مع إرسال الأحداث إلى on_event فور حدوثها
+
+    on_event قد يُستدعى من عدة خيوط في الوقت نفسه، و on_stage يُستدعى بعد كل مرحلة
+    بالبيانات التي أنتجتها.
+    """
+
+    def __init__(self, target, threads=10, verbose=False, budget=None, reverse_dns=False, syn_scan=False,
+                 dedup=True, dedup_verify=0.0, wp_plugins=None, wp_themes=None,
+                 http=None, rate_limiter=None, on_event=None, on_stage=None, allow_target_file=False):
+        self.target = target
+        self.allow_target_file = allow_target_file
+        self.threads = threads
+        self.verbose = verbose
+        self.budget = budget or ScanBudget()
+        self.reverse_dns = reverse_dns
+        self.syn_scan = syn_scan
+        self.dedup = dedup
+        self.dedup_verify = dedup_verify
+        self.wp_plugins = wp_plugins
+        self.wp_themes = wp_themes
+        self.rate_limiter = rate_limiter
+        self.http = http or http_pool
+        if rate_limiter:
+            self.http = RateLimitedHTTP(self.http, rate_limiter)
+        self.on_event = on_event
+        self.on_stage = on_stage
+        self.results = {}
+
+    def run(self):
+        """تنفيذ المراحل بالتتابع وإرجاع قاموس النتائج"""
+        # 1. اكتشاف الأصول
+        with tracer.span('asset_discovery', 'stage'):
+            asset_discovery = AssetDiscovery(
+                self.target, self.threads, self.verbose, self.reverse_dns, self.budget, self.syn_scan,
+                http=self.http, rate_limiter=self.rate_limiter, on_event=self.on_event,
+                allow_target_file=self.allow_target_file
+            )
+            self.results.update(asset_discovery.discover())
+        self._finish_stage('asset_discovery', {
+            key: self.results[key] for key in ('hosts', 'hostnames', 'reverse_dns', 'ports', 'web_services')
+        })
+
+        # 2. فحص ثغرات WordPress
+        wp_scanner = WordPressScanner(self.target, self.verbose, self.budget, self.wp_plugins, self.wp_themes,
+                                      http=self.http, on_event=self.on_event)
+        with tracer.span('wordpress', 'stage'):
+            self.results['wordpress'] = self._scan_web(wp_scanner)
+        self._finish_stage('wordpress', self.results['wordpress'])
+
+        # 3. فحص ثغرات Craft CMS
+        craft_scanner = CraftCMSScanner(self.target, self.verbose, self.budget, http=self.http, on_event=self.on_event)
+        with tracer.span('craftcms', 'stage'):
+            self.results['craftcms'] = self._scan_web(craft_scanner)
+        self._finish_stage('craftcms', self.results['craftcms'])
+
+        # 4. فحص ثغرات SMB لجميع المضيفين الذين لديهم منافذ SMB مفتوحة
+        smb_scanner = SMBScanner(self.target, self.verbose, self.budget, http=self.http, on_event=self.on_event)
+        with tracer.span('smb', 'stage'):
+            self.results['smb'] = smb_scanner.scan(self.results['ports'])
+        self._finish_stage('smb', self.results['smb'])
+
+        # 5. فحص ثغرات Zyxel
+        zyxel_scanner = ZyxelScanner(self.target, self.verbose, self.budget, http=self.http, on_event=self.on_event)
+        with tracer.span('zyxel', 'stage'):
+            self.results['zyxel'] = zyxel_scanner.scan(self.results['web_services'])
+        self._finish_stage('zyxel', self.results['zyxel'])
+
+        self.results['coverage'] = self.budget.coverage()
+        return self.results
+
+    def _scan_web(self, scanner):
+        """تشغيل فاحص ويب مع تجميع الخدمات المتطابقة إن كان مفعلاً"""
+        if not self.dedup:
+            return scanner.scan(self.results['web_services'])
+        return scan_deduplicated(scanner, self.results['web_services'], self.dedup_verify, self.verbose)
+
+    def _finish_stage(self, stage, data):
+        """إبلاغ المستمع بعد انتهاء مرحلة، ثم التحقق من طلب الإلغاء"""
+        if self.on_stage:
+            self.on_stage(stage, data)
+
+        cancel_event = self.budget.cancel_event
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled(f"تم إلغاء الفحص بعد مرحلة {stage}")
+
+
+class ScanStream:
+    """فحص يعمل في خيط خلفي ويعطي الأحداث فور حدوثها عبر مكرر عادي
+
+    تُمرر كل الأحداث أيضًا إلى sinks (دوال تستقبل الحدث) من خيوط الفحص مباشرة.
+    إغلاق التدفق قبل نهايته يلغي الفحص، وبعد نهايته تتوفر النتائج الكاملة في results.
+    مع quiet=True تُكتم الطرفية المشتركة للعملية كلها طوال مدة الفحص (انظر console.muted).
+    """
+
+    def __init__(self, target, sinks=(), quiet=True, buffer=1000, time_budget=None, priority_hosts=(), **options):
+        self.target = target
+        self.sinks = list(sinks)
+        self.results = None
+        # الطابور المحدود يبطئ الفحص إذا تأخر المستهلك بدل تراكم الأحداث في الذاكرة
+        self._events = queue.Queue(maxsize=buffer)
+        self._cancel = threading.Event()
+        self._budget = ScanBudget(time_budget, self._cancel, priority_hosts)
+        self._pipeline = ScanPipeline(target, budget=self._budget, on_event=self._emit, **options)
+        self._thread = None
+        self.quiet = quiet
+
+    def start(self):
+        """تشغيل الفحص في الخلفية"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ScanSayer-Stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """إلغاء الفحص وإنهاء التدفق"""
+        self._cancel.set()
+        try:
+            self._events.put_nowait(_END)
+        except queue.Full:
+            pass
+
+    def _put(self, item):
+        """إضافة عنصر إلى الطابور ما لم يُلغَ التدفق"""
+        while not self._cancel.is_set():
+            try:
+                self._events.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _emit(self, event):
+        """استقبال حدث من خيوط الفحص"""
+        for sink in self.sinks:
+            sink(event)
+        self._put(event)
+
+    def _run(self):
+        """تنفيذ الفحص وإنهاء التدفق بالنتيجة أو الخطأ"""
+        item = _END
+        # الكتم يقتصر على مدة هذا الفحص ولا يغير إعداد quiet، لكنه يشمل كل خيوط العملية
+        with console.muted() if self.quiet else nullcontext():
+            try:
+                self.results = self._pipeline.run()
+            except ScanCancelled:
+                pass
+            except Exception as e:
+                item = e
+        self._put(item)
+
+    def next_event(self):
+        """الحدث التالي، أو None عند نهاية الفحص (يرفع خطأ الفحص إن فشل)"""
+        if self._thread is None:
+            self.start()
+
+        item = self._events.get()
+        if item is _END:
+            # إبقاء علامة النهاية لأي استدعاء لاحق
+            self._events.put(_END)
+            return None
+        if isinstance(item, Exception):
+            self._events.put(_END)
+            raise item
+        return item
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        event = self.next_event()
+        if event is None:
+            raise StopIteration
+        return event
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scan_events(target, **kwargs):
+    """بدء فحص وإرجاع مكرر يعطي أحداث HostEvent و PortEvent و ServiceEvent و FindingEvent
+
+    يقبل خيارات ScanPipeline (threads, http, rate_limiter, ...) إضافة إلى sinks و time_budget.
+    إيقاف التكرار مبكرًا (break أو إغلاق المولد) يلغي الفحص حتى لا تبقى خيوطه عالقة
+    بانتظار مستهلك لن يقرأ.
+    """
+    stream = ScanStream(target, **kwargs).start()
+    try:
+        yield from stream
+    finally:
+        stream.close()
+
+
+async def ascan_events(target, **kwargs):
+    """نسخة غير متزامنة من scan_events: مولد async يعطي الأحداث فور حدوثها"""
+    stream = ScanStream(target, **kwargs).start()
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            event = await loop.run_in_executor(None, stream.next_event)
+            if event is None:
+                return
+            yield event
+    finally:
+        stream.close()
+
+
+class JSONLinesSink:
+    """مخرج يكتب كل حدث كسطر JSON في ملف أو كائن ملف مفتوح"""
+
+    def __init__(self, file):
+        self._owned = isinstance(file, str)
+        self._file = open(file, 'a', encoding='utf-8') if self._owned else file
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=json_default)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        """إغلاق الملف إن كان المخرج هو من فتحه"""
+        if self._owned:
+            self._file.close()
@@ -8,22 +8,42 @@
 """
 
 import socket
+import ssl
 import ipaddress
 import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor
+import threading
 
 import requests
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
-from rich.console import Console
+from rich.markup import escape
 
-# تهيئة وحدة الطباعة الغنية
-console = Console()
+from .connection_pool import http_pool
+from .dns_resolver import resolver
+from .events import HostEvent, PortEvent, ServiceEvent
+from .output import console
+from .port_store import PortStore
+from .profiler import tracer, traced
+from .scheduler import ScanBudget, run_prioritized
+from .service_probes import ServiceProber
+from .syn_scanner import SynScanner
+from .tls_cache import tls_cache
+from .web_dedup import fingerprint_response
 
 # إعداد وكيل المستخدم العشوائي
 ua = UserAgent()
 
+# المنافذ الشائعة التي تُفحص عند عدم توفر nmap
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 111, 135, 139, 143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080, 8443]
+
+# خدمات معروفة لا تتحدث HTTP: منافذها لا تُجرب عليها مصافحة TLS ولا طلب HTTP
+NON_WEB_SERVICES = {
+    'ftp', 'ssh', 'telnet', 'smtp', 'domain', 'pop3', 'rpcbind', 'msrpc', 'netbios-ssn', 'imap',
+    'microsoft-ds', 'imaps', 'pop3s', 'pptp', 'mysql', 'ms-wbt-server', 'vnc', 'postgresql',
+    'ms-sql-s', 'redis', 'mongodb', 'ldap', 'snmp', 'submission', 'smtps'
+}
+
 # التحقق من وجود nmap
 def is_nmap_installed():
     """التحقق من وجود nmap على النظام"""
@@ -46,54 +66,124 @@ def is_nmap_installed():
 class AssetDiscovery:
     """فئة اكتشاف الأصول في الشبكة"""
     
-    def __init__(self, target, threads=10, verbose=False):
+    def __init__(self, target, threads=10, verbose=False, reverse_dns=False, budget=None, syn_scan=False,
+                 http=None, rate_limiter=None, on_event=None, allow_target_file=False):
         self.target = target
+        # قراءة الأهداف من ملف (@path) مسموحة لسطر الأوامر فقط، لا للمهام الواردة عبر الشبكة
+        self.allow_target_file = allow_target_file
         self.threads = threads
         self.verbose = verbose
+        self.reverse_dns = reverse_dns
+        self.syn_scan = syn_scan
+        self.http = http or http_pool
+        self.rate_limiter = rate_limiter
+        self.on_event = on_event
+        self.budget = budget or ScanBudget()
         self.hosts = []
-        self.ports = {}
+        self.hostnames = {}
+        self.reverse_names = {}
+        self.ports = PortStore()
         self.web_services = []
+        self._claimed_urls = set()
+        self._web_lock = threading.Lock()
         self.nmap_available = is_nmap_installed()
+        self.prober = ServiceProber(budget=self.budget)
     
     def discover(self):
         """اكتشاف الأصول في الشبكة المستهدفة"""
         console.print("\n[bold blue]بدء اكتشاف الأصول...[/bold blue]")
         
         # تحديد نطاق الأهداف
-        self._identify_targets()
+        with tracer.span('identify_targets', 'stage'):
+            self._identify_targets()
+        for host in self.hosts:
+            self._emit(HostEvent(host, self.hostnames.get(host, [])))
         
         # فحص المنافذ المفتوحة
-        self._scan_ports()
+        with tracer.span('scan_ports', 'stage'):
+            self._scan_ports()
         
         # اكتشاف خدمات الويب
-        self._discover_web_services()
+        with tracer.span('discover_web_services', 'stage'):
+            self._discover_web_services()
         
         return {
             'hosts': self.hosts,
+            'hostnames': self.hostnames,
+            'reverse_dns': self.reverse_names,
             'ports': self.ports,
             'web_services': self.web_services
         }
     
+    def _emit(self, event):
+        """إرسال حدث إلى المستمع إن وُجد"""
+        if self.on_event:
+            self.on_event(event)
+    
+    def _add_port(self, host, port, state, service, version):
+        """تسجيل نتيجة منفذ وإرسالها كحدث"""
+        self.ports.add(host, port, state, service, version)
+        self._emit(PortEvent(host, port, state, service, version))
+    
+    def _parse_target_list(self):
+        """تفكيك الهدف إلى عناصر: قائمة مفصولة بفواصل أو ملف بصيغة @path"""
+        if self.target.startswith('@'):
+            if not self.allow_target_file:
+                raise ValueError("قراءة الأهداف من ملف (@path) غير مسموحة هنا")
+            with open(self.target[1:], 'r', encoding='utf-8') as f:
+                entries = [line.strip() for line in f]
+        else:
+            entries = [entry.strip() for entry in self.target.split(',')]
+        return [entry for entry in entries if entry and not entry.startswith('#')]
+    
     def _identify_targets(self):
         """تحديد الأهداف للفحص"""
         try:
-            if '/' in self.target:
-                # CIDR notation
-                network = ipaddress.ip_network(self.target, strict=False)
-                self.hosts = [str(ip) for ip in network.hosts()]
-                console.print(f"  [green]تم تحديد {len(self.hosts)} هدف في النطاق {self.target}[/green]")
-            else:
-                # Single IP or hostname
-                ip = socket.gethostbyname(self.target)
-                self.hosts = [ip]
-                console.print(f"  [green]تم تحديد الهدف: {ip}[/green]")
-        except (socket.gaierror, ValueError) as e:
+            names = []
+            for entry in self._parse_target_list():
+                if '/' in entry:
+                    # CIDR notation
+                    network = ipaddress.ip_network(entry, strict=False)
+                    network_hosts = [str(ip) for ip in network.hosts()]
+                    self.hosts.extend(network_hosts)
+                    console.print(f"  [green]تم تحديد {len(network_hosts)} هدف في النطاق {entry}[/green]")
+                else:
+                    try:
+                        self.hosts.append(str(ipaddress.ip_address(entry)))
+                    except ValueError:
+                        names.append(entry)
+            
+            # تحليل أسماء المضيفين بالتوازي مع الاحتفاظ بالربط بين العنوان والاسم
+            for name, addresses in resolver.resolve_many(names).items():
+                if not addresses:
+                    console.print(f"  [bold red]خطأ في تحديد الأهداف: تعذر تحليل الاسم {name}[/bold red]")
+                    continue
+                
+                for address in addresses:
+                    self.hostnames.setdefault(address, []).append(name)
+                self.hosts.extend(addresses)
+                console.print(f"  [green]تم تحديد الهدف: {name} ({', '.join(addresses)})[/green]")
+            
+            self.hosts = list(dict.fromkeys(self.hosts))
+            
+            if self.reverse_dns:
+                candidates = [host for host in self.hosts if host not in self.hostnames]
+                self.reverse_names = resolver.reverse_many(candidates)
+                if self.verbose:
+                    for address, name in self.reverse_names.items():
+                        console.print(f"    [green]{address} -> {name}[/green]")
+        except (OSError, ValueError) as e:
             console.print(f"  [bold red]خطأ في تحديد الأهداف: {str(e)}[/bold red]")
     
     def _scan_ports(self):
         """فحص المنافذ المفتوحة"""
         console.print("\n[bold blue]فحص المنافذ المفتوحة...[/bold blue]")
         
+        if self.syn_scan:
+            if SynScanner.available():
+                return self._scan_ports_with_syn()
+            console.print("  [yellow]فحص SYN يتطلب صلاحيات root، سيتم استخدام الطريقة الافتراضية[/yellow]")
+        
         if self.nmap_available:
             self._scan_ports_with_nmap()
         else:
@@ -106,28 +196,44 @@ class AssetDiscovery:
             import nmap
             nm = nmap.PortScanner()
             
-            for host in self.hosts:
+            # المضيفون ذوو الثغرات السابقة أولاً
+            hosts = sorted(self.hosts, key=self.budget.host_priority)
+            self.budget.plan('ports', len(hosts))
+            
+            for host in hosts:
+                if self.budget.expired():
+                    console.print("  [yellow]انتهت المهلة الزمنية، تم إيقاف فحص المنافذ[/yellow]")
+                    break
+                
                 try:
                     console.print(f"  [cyan]فحص المنافذ للهدف: {host}[/cyan]")
-                    nm.scan(host, arguments='-sS -sV -T4 --top-ports 1000')
+                    with tracer.span('nmap.scan', 'probe', host=host):
+                        arguments = '-sS -sV -T4 --top-ports 1000'
+                        if ':' in host:
+                            arguments += ' -6'
+                        remaining = self.budget.remaining()
+                        if remaining is not None:
+                            arguments += f' --host-timeout {max(1, int(remaining))}s'
+                        nm.scan(host, arguments=arguments)
                     
-                    self.ports[host] = []
+                    self.budget.done('ports')
+                    
+                    self.ports.add_host(host)
                     
                     for proto in nm[host].all_protocols():
                         lport = sorted(nm[host][proto].keys())
                         for port in lport:
                             service = nm[host][proto][port]
-                            port_info = {
-                                'port': port,
-                                'state': service['state'],
-                                'service': service['name'],
-                                'version': service.get('product', '') + ' ' + service.get('version', '')
-                            }
-                            
-                            self.ports[host].append(port_info)
+                            self._add_port(
+                                host,
+                                port,
+                                service['state'],
+                                service['name'],
+                                service.get('product', '') + ' ' + service.get('version', '')
+                            )
                             
                             if self.verbose and service['state'] == 'open':
-                                console.print(f"    [green]المنفذ {port}/{proto}: {service['name']} {service.get('product', '')} {service.get('version', '')}[/green]")
+                                console.print(f"    [green]المنفذ {port}/{proto}: {escape(service['name'])} {escape(service.get('product', ''))} {escape(service.get('version', ''))}[/green]")
                 except Exception as e:
                     console.print(f"    [bold red]خطأ في فحص المنافذ للهدف {host}: {str(e)}[/bold red]")
         except ImportError:
@@ -136,41 +242,83 @@ class AssetDiscovery:
     
     def _scan_ports_with_socket(self):
         """فحص المنافذ المفتوحة باستخدام socket"""
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 111, 135, 139, 143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080, 8443]
+        console.print(f"  [cyan]فحص المنافذ لـ {len(self.hosts)} هدف[/cyan]")
+        for host in self.hosts:
+            self.ports.add_host(host)
         
+        # ترتيب الفحوصات حسب القيمة المتوقعة: المضيفون ذوو الثغرات السابقة ثم المنافذ الأخطر
+        probes = sorted(((host, port) for host in self.hosts for port in COMMON_PORTS), key=self.budget.probe_priority)
+        self._probe_ports(probes, 'ports')
+    
+    def _scan_ports_with_syn(self):
+        """فحص المنافذ بحزم SYN نصف مفتوحة ثم التعرف على خدمات المنافذ المفتوحة فقط"""
+        console.print(f"  [cyan]فحص SYN للمنافذ لـ {len(self.hosts)} هدف[/cyan]")
         for host in self.hosts:
-            console.print(f"  [cyan]فحص المنافذ للهدف: {host}[/cyan]")
-            self.ports[host] = []
-            
-            with ThreadPoolExecutor(max_workers=self.threads) as executor:
-                futures = {executor.submit(self._check_port, host, port): port for port in common_ports}
+            self.ports.add_host(host)
+        
+        # المقبس الخام يدعم IPv4 فقط، وعناوين IPv6 تُفحص بالاتصال الكامل
+        ipv4_hosts = [host for host in self.hosts if ':' not in host]
+        ipv6_hosts = [host for host in self.hosts if ':' in host]
+        
+        probes = sorted(((host, port) for host in ipv4_hosts for port in COMMON_PORTS), key=self.budget.probe_priority)
+        with tracer.span('SynScanner.scan', 'probe', probes=len(probes)):
+            states = SynScanner().scan(probes, self.budget, 'ports')
+        
+        open_probes = sorted((probe for probe, state in states.items() if state == 'open'), key=self.budget.probe_priority)
+        if self.verbose:
+            console.print(f"    [blue]{len(open_probes)} منفذ مفتوح من أصل {len(probes)}، جاري التعرف على الخدمات[/blue]")
+        self._probe_ports(open_probes, 'services')
+        
+        if ipv6_hosts:
+            probes = sorted(((host, port) for host in ipv6_hosts for port in COMMON_PORTS), key=self.budget.probe_priority)
+            self._probe_ports(probes, 'ports')
+    
+    def _probe_ports(self, probes, stage):
+        """الاتصال بالمنافذ بالتوازي والتعرف على خدماتها وتسجيل المفتوح منها"""
+        for (host, port), port_info, error in run_prioritized(self._check_port, probes, self.threads, self.budget, stage):
+            if error:
+                if self.verbose:
+                    console.print(f"    [red]خطأ في فحص المنفذ {port} للهدف {host}: {str(error)}[/red]")
+            elif port_info:
+                self._add_port(host, port, port_info['state'], port_info['service'], port_info['version'])
                 
-                for future in futures:
-                    port = futures[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            port_info = {
-                                'port': port,
-                                'state': 'open',
-                                'service': self._get_service_name(port),
-                                'version': ''
-                            }
-                            self.ports[host].append(port_info)
-                            
-                            if self.verbose:
-                                console.print(f"    [green]المنفذ {port}/tcp: {port_info['service']}[/green]")
-                    except Exception as e:
-                        if self.verbose:
-                            console.print(f"    [red]خطأ في فحص المنفذ {port}: {str(e)}[/red]")
+                if self.verbose:
+                    console.print(f"    [green]{host} المنفذ {port}/tcp: {escape(port_info['service'])} {escape(port_info['version'])}[/green]")
+        
+        if self.budget.expired():
+            console.print("  [yellow]انتهت المهلة الزمنية، تم إيقاف فحص المنافذ[/yellow]")
     
+    @traced('AssetDiscovery._check_port', args=('host', 'port'))
     def _check_port(self, host, port):
-        """التحقق من حالة منفذ محدد"""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
+        """التحقق من حالة منفذ محدد والتعرف على خدمته عبر الاتصال نفسه"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.budget.timeout(1))
+        try:
+            if sock.connect_ex((host, port)) != 0:
+                return None
+            
+            service = self.prober.identify(sock, host, port)
+        finally:
+            sock.close()
+        
+        port_info = {
+            'port': port,
+            'state': 'open',
+            'service': self._get_service_name(port),
+            'version': ''
+        }
+        
+        if service:
+            port_info['service'] = service['service']
+            port_info['version'] = ' '.join(filter(None, [service['product'], service['version']]))
+            if service['info']:
+                port_info['version'] += f" ({service['info']})"
+        
+        return port_info
     
     def _get_service_name(self, port):
         """الحصول على اسم الخدمة بناءً على رقم المنفذ"""
@@ -200,22 +348,91 @@ class AssetDiscovery:
         return services.get(port, 'unknown')
     
     def _discover_web_services(self):
-        """اكتشاف خدمات الويب"""
+        """اكتشاف خدمات الويب على المنافذ المفتوحة فقط"""
         console.print("\n[bold blue]اكتشاف خدمات الويب...[/bold blue]")
         
-        web_ports = [80, 443, 8080, 8443]
+        checks = sorted(
+            (
+                # فحص لكل اسم مرتبط بالعنوان لأن المضيفات الافتراضية قد تشترك في عنوان واحد
+                (host, port, hostname)
+                for host in self.hosts for port in self.ports.open_ports(host)
+                if self._service_name(host, port) not in NON_WEB_SERVICES
+                for hostname in self.hostnames.get(host) or [None]
+            ),
+            key=self.budget.probe_priority
+        )
+        
+        # الأخطاء داخل _check_web_service تُعالج هناك، والنتائج تُضاف إلى self.web_services
+        for _ in run_prioritized(self._check_web_service, checks, self.threads, self.budget, 'web_services'):
+            pass
+    
+    @traced('AssetDiscovery._sniff_scheme', args=('host', 'port'))
+    def _sniff_scheme(self, host, port, server_name=None):
+        """تحديد البروتوكول (http أو https) بمحاولة مصافحة TLS سريعة"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        
+        try:
+            sock = socket.create_connection((host, port), timeout=self.budget.timeout(3))
+        except OSError:
+            return None
         
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            for host in self.hosts:
-                for port in web_ports:
-                    executor.submit(self._check_web_service, host, port)
+        with sock:
+            try:
+                # المصافحة هنا تملأ ذاكرة الجلسات والشهادات لطلبات HTTPS اللاحقة
+                with tls_cache.context.wrap_socket(sock, server_hostname=server_name or host):
+                    return 'https'
+            except ssl.SSLError:
+                # المنفذ مفتوح لكنه لا يتحدث TLS
+                return 'http'
+            except OSError:
+                # مصافحة معلقة أو مقطوعة: خوادم الأجهزة المدمجة (مثل RomPager) تنتظر طلب HTTP
+                # ولا ترد على ClientHello، فيُعتمد اسم الخدمة المعروف للمنفذ
+                service = self._service_name(host, port)
+                if service in NON_WEB_SERVICES:
+                    return None
+                return 'https' if 'https' in service or 'ssl' in service else 'http'
     
-    def _check_web_service(self, host, port):
-        """فحص خدمة ويب على منفذ محدد"""
+    def _service_name(self, host, port):
+        """اسم الخدمة المسجل للمنفذ ('' إن لم يكن معروفًا)"""
+        port_info = self.ports.port_info(host, port)
+        return (port_info['service'] or '') if port_info else ''
+    
+    def _build_url(self, scheme, host, port):
+        """بناء عنوان URL مع حذف المنفذ الافتراضي للبروتوكول"""
+        if ':' in host:
+            host = f"[{host}]"
+        if (scheme, port) in (('http', 80), ('https', 443)):
+            return f"{scheme}://{host}"
+        return f"{scheme}://{host}:{port}"
+    
+    @traced('AssetDiscovery._check_web_service', args=('host', 'port', 'hostname'))
+    def _check_web_service(self, host, port, hostname=None):
+        """فحص خدمة ويب على منفذ محدد باسم المضيف الأصلي (لترويسة Host و SNI) أو بالعنوان"""
+        scheme = self._sniff_scheme(host, port, hostname)
+        if not scheme:
+            return
+        
         try:
-            url = f"http://{host}:{port}" if port != 443 else f"https://{host}"
+            url = self._build_url(scheme, hostname or host, port)
+            
+            # الاسم نفسه قد يُحلَّل إلى عدة عناوين تخدم الموقع ذاته، فيُحجز الرابط قبل الطلب
+            # حتى لا تفحصه عدة خيوط في الوقت نفسه
+            with self._web_lock:
+                if url in self._claimed_urls:
+                    return
+                self._claimed_urls.add(url)
+            
             headers = {'User-Agent': ua.random}
-            response = requests.get(url, headers=headers, timeout=10, verify=False)
+            # الطلب يُرسل إلى العنوان المفحوص نفسه لا إلى ما يختاره تحليل الاسم، عبر عميل HTTP
+            # المحقون إن كان يدعم التثبيت (HTTPPool و RateLimitedHTTP)، وإلا يُحلل الاسم كالمعتاد
+            pinned = getattr(self.http, 'pinned', None)
+            client = pinned(url, host) if hostname and pinned else None
+            try:
+                response = (client or self.http).get(url, headers=headers, timeout=self.budget.timeout(10), verify=False)
+            finally:
+                if client is not None:
+                    client.close()
             
             if response.status_code == 200:
                 server = response.headers.get('Server', 'Unknown')
@@ -223,18 +440,28 @@ class AssetDiscovery:
                 
                 web_service = {
                     'url': url,
+                    'host': host,
+                    'hostname': hostname,
+                    'port': port,
+                    'scheme': scheme,
                     'status': response.status_code,
                     'server': server,
-                    'title': title
+                    'title': title,
+                    'certificate': tls_cache.certificate(hostname or host, port) if scheme == 'https' else None,
+                    'fingerprint': fingerprint_response(response)
                 }
                 
                 self.web_services.append(web_service)
+                self._emit(ServiceEvent(host, port, url, scheme, response.status_code, server, title))
                 
                 if self.verbose:
-                    console.print(f"  [green]خدمة ويب: {url} | Server: {server} | Title: {title}[/green]")
+                    console.print(f"  [green]خدمة ويب: {escape(url)} | Server: {escape(server)} | Title: {escape(title)}[/green]")
         except requests.exceptions.RequestException:
-            pass
+            # فشل الطلب يحرر الرابط لتجربته عبر عنوان آخر للاسم نفسه
+            with self._web_lock:
+                self._claimed_urls.discard(url)
     
+    @traced('AssetDiscovery._extract_title', 'parse')
     def _extract_title(self, html):
         """استخراج عنوان الصفحة من HTML"""
         try:
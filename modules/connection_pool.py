@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة مجمعات الاتصالات المشتركة لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+import smb.SMBConnection
+from requests.adapters import HTTPAdapter
+
+from .tls_cache import tls_cache
+
+
+class _TLSCacheAdapter(HTTPAdapter):
+    """محول HTTP يستخدم سياق TLS المشترك لاستئناف الجلسات والتقاط الشهادات"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = tls_cache.context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+class _PinnedAdapter(_TLSCacheAdapter):
+    """محول يرسل الطلبات إلى عنوان IP محدد مع إبقاء اسم المضيف في ترويسة Host و SNI"""
+
+    def __init__(self, hostname, address, **kwargs):
+        self.hostname = hostname
+        self.address = f"[{address}]" if ':' in address else address
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['server_hostname'] = self.hostname
+        return super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers['Host'] = parts.netloc
+        netloc = f"{self.address}:{parts.port}" if parts.port else self.address
+        request.url = parts._replace(netloc=netloc).geturl()
+        return super().send(request, **kwargs)
+
+
+def create_session(pool_size=10):
+    """جلسة requests مستقلة (ملفات تعريف ارتباط خاصة بها) تستخدم سياق TLS المشترك"""
+    session = requests.Session()
+    adapter = _TLSCacheAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def create_pinned_session(url, address):
+    """جلسة ترسل طلبات أصل الرابط (المخطط والاسم والمنفذ) إلى عنوان IP محدد بدل تحليل الاسم
+
+    تفيد عند فحص كل عنوان من عناوين الاسم نفسه على حدة، أما الروابط الأخرى فتُرسل كالمعتاد.
+    """
+    session = create_session(1)
+    session.mount(url.rstrip('/') + '/', _PinnedAdapter(urlsplit(url).hostname, address, pool_connections=1, pool_maxsize=1))
+    return session
+
+
+class HTTPPool:
+    """جلسة HTTP مشتركة تحتفظ باتصالات keep-alive بين الفحوصات دون ملفات تعريف الارتباط
+
+    الفحوصات التي تحتاج حالة (مثل تسجيل الدخول) تستخدم جلسة مستقلة من create_session.
+    """
+
+    def __init__(self, pool_size=100):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._session = None
+
+    @property
+    def session(self):
+        """إنشاء الجلسة عند أول استخدام"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = create_session(self.pool_size)
+                    # الجلسة تعيش طوال عمر الخادم وتُشارك بين المهام والمضيفين، فلا تُحفظ
+                    # ملفات تعريف الارتباط حتى لا تتراكم أو تؤثر على نتائج الفحوصات اللاحقة
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    self._session = session
+        return self._session
+
+    def get(self, url, **kwargs):
+        """إرسال طلب GET عبر الجلسة المشتركة"""
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """إرسال طلب HTTP عبر الجلسة المشتركة"""
+        kwargs.setdefault('timeout', 10)
+        kwargs.setdefault('verify', False)
+        return self.session.request(method, url, **kwargs)
+
+    def pinned(self, url, address):
+        """عميل مؤقت يرسل طلبات أصل الرابط إلى عنوان IP محدد (يُغلق بعد الاستخدام)"""
+        return create_pinned_session(url, address)
+
+    def close(self):
+        """إغلاق جميع الاتصالات المفتوحة"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class RateLimitedHTTP:
+    """غلاف لعميل HTTP (HTTPPool أو requests.Session) يمرر كل طلب عبر محدد معدل"""
+
+    def __init__(self, client, limiter):
+        self.client = client
+        self.limiter = limiter
+
+    def get(self, url, **kwargs):
+        """إرسال طلب GET بعد انتظار دور المحدد"""
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """إرسال طلب HTTP بعد انتظار دور المحدد"""
+        self.limiter.acquire()
+        return self.client.request(method, url, **kwargs)
+
+    def pinned(self, url, address):
+        """نسخة مثبتة على عنوان IP من العميل المغلَّف مع المحدد نفسه (None إن لم يدعمها)"""
+        pinned = getattr(self.client, 'pinned', None)
+        client = pinned(url, address) if pinned else None
+        return RateLimitedHTTP(client, self.limiter) if client is not None else None
+
+    def close(self):
+        """إغلاق العميل المغلَّف إن كان يدعم الإغلاق"""
+        close = getattr(self.client, 'close', None)
+        if close:
+            close()
+
+
+class SMBPool:
+    """مجمع اتصالات SMB مجهولة قابلة لإعادة الاستخدام لكل مضيف"""
+
+    def __init__(self, max_idle_per_host=2):
+        self.max_idle_per_host = max_idle_per_host
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    def acquire(self, host, port=445, timeout=10):
+        """الحصول على اتصال SMB جاهز، أو إنشاء اتصال جديد"""
+        while True:
+            with self._lock:
+                idle = self._idle.get((host, port), [])
+                conn = idle.pop() if idle else None
+
+            if conn is None:
+                break
+
+            # التأكد من أن الاتصال الخامل ما زال حيًا
+            try:
+                conn.echo(b'ScanSayer', timeout=timeout)
+                return conn
+            except Exception:
+                self._close(conn)
+
+        # المنفذ 445 يستخدم SMB مباشرة فوق TCP، أما 139 فيحتاج جلسة NetBIOS
+        conn = smb.SMBConnection.SMBConnection('', '', 'ScanSayer', host, use_ntlm_v2=True, is_direct_tcp=(port == 445))
+        if not conn.connect(host, port, timeout=timeout):
+            self._close(conn)
+            return None
+        return conn
+
+    def release(self, host, conn, port=445):
+        """إعادة الاتصال إلى المجمع بعد الانتهاء منه"""
+        with self._lock:
+            idle = self._idle.setdefault((host, port), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        self._close(conn)
+
+    def close(self):
+        """إغلاق جميع الاتصالات الخاملة"""
+        with self._lock:
+            connections = [conn for idle in self._idle.values() for conn in idle]
+            self._idle = {}
+
+        for conn in connections:
+            self._close(conn)
+
+    def _close(self, conn):
+        """إغلاق اتصال مع تجاهل الأخطاء"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# المجمعات المشتركة بين جميع الوحدات وبين مهام الخادم
+http_pool = HTTPPool()
+smb_pool = SMBPool()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تحليل أسماء النطاقات المتزامن مع التخزين المؤقت لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .profiler import traced
+
+# dnspython اختياري: يتيح قراءة TTL الفعلي للسجلات
+try:
+    import dns.exception
+    import dns.resolver
+    import dns.reversename
+    DNSPYTHON_AVAILABLE = True
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+
+
+class DNSResolver:
+    """محلل أسماء متزامن مع ذاكرة مؤقتة تحترم TTL"""
+
+    def __init__(self, threads=50, default_ttl=300, negative_ttl=60):
+        self.threads = threads
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key):
+        """قراءة قيمة من الذاكرة المؤقتة إن لم تنتهِ صلاحيتها"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry
+            self._cache.pop(key, None)
+            return None
+
+    def _store(self, key, value, ttl):
+        """تخزين قيمة مع مدة صلاحيتها"""
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+
+    @traced('DNSResolver.resolve', args=('name',))
+    def resolve(self, name):
+        """إرجاع جميع عناوين A و AAAA للاسم (قائمة فارغة عند الفشل)"""
+        entry = self._cached(('forward', name))
+        if entry:
+            return entry[1]
+
+        if DNSPYTHON_AVAILABLE:
+            addresses, ttl = self._resolve_dnspython(name)
+        else:
+            addresses, ttl = self._resolve_system(name)
+
+        self._store(('forward', name), addresses, ttl if addresses else self.negative_ttl)
+        return addresses
+
+    def _resolve_system(self, name):
+        """التحليل عبر محلل النظام (بدون معلومات TTL)"""
+        try:
+            infos = socket.getaddrinfo(name, None, proto=socket.IPPROTO_TCP)
+        except (socket.gaierror, UnicodeError):
+            return [], self.negative_ttl
+
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            if family in (socket.AF_INET, socket.AF_INET6) and sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+
+        # IPv4 أولاً للحفاظ على سلوك gethostbyname السابق
+        addresses.sort(key=lambda address: ':' in address)
+        return addresses, self.default_ttl
+
+    def _resolve_dnspython(self, name):
+        """التحليل عبر dnspython مع استخدام أقل TTL بين السجلات"""
+        addresses = []
+        ttls = []
+
+        for record_type in ('A', 'AAAA'):
+            try:
+                answer = dns.resolver.resolve(name, record_type)
+            except dns.exception.DNSException:
+                continue
+            ttls.append(answer.rrset.ttl)
+            addresses.extend(record.to_text() for record in answer)
+
+        if not addresses:
+            # قد يكون الاسم معرفًا محليًا فقط (مثل /etc/hosts)
+            return self._resolve_system(name)
+        return addresses, min(ttls)
+
+    @traced('DNSResolver.reverse', args=('address',))
+    def reverse(self, address):
+        """البحث العكسي (PTR) لعنوان IP"""
+        entry = self._cached(('reverse', address))
+        if entry:
+            return entry[1]
+
+        hostname, ttl = None, self.negative_ttl
+        if DNSPYTHON_AVAILABLE:
+            try:
+                answer = dns.resolver.resolve(dns.reversename.from_address(address), 'PTR')
+                hostname, ttl = answer[0].to_text().rstrip('.'), answer.rrset.ttl
+            except dns.exception.DNSException:
+                pass
+        else:
+            try:
+                hostname, ttl = socket.gethostbyaddr(address)[0], self.default_ttl
+            except (socket.herror, socket.gaierror, OSError):
+                pass
+
+        self._store(('reverse', address), hostname, ttl)
+        return hostname
+
+    def resolve_many(self, names):
+        """تحليل قائمة أسماء بالتوازي وإرجاع قاموس {الاسم: [العناوين]}"""
+        return self._map(self.resolve, names)
+
+    def reverse_many(self, addresses):
+        """بحث عكسي متوازٍ وإرجاع قاموس {العنوان: الاسم} للعناوين التي لها PTR"""
+        results = self._map(self.reverse, addresses)
+        return {address: name for address, name in results.items() if name}
+
+    def _map(self, func, items):
+        """تنفيذ دالة على العناصر الفريدة بالتوازي"""
+        items = list(dict.fromkeys(items))
+        if len(items) <= 1:
+            return {item: func(item) for item in items}
+
+        with ThreadPoolExecutor(max_workers=min(self.threads, len(items))) as executor:
+            return dict(zip(items, executor.map(func, items)))
+
+
+# محلل مشترك تبقى ذاكرته المؤقتة صالحة بين مهام الخادم
+resolver = DNSResolver()
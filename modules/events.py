@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة أحداث الفحص المتدفقة لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlparse
+
+# المنفذ الافتراضي لكل بروتوكول عند غيابه من الرابط
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class ScanEvent:
+    """الأساس المشترك لأحداث الفحص"""
+
+    type = 'event'
+
+    def to_dict(self):
+        """تحويل الحدث إلى قاموس قابل للتسلسل مع نوعه"""
+        data = asdict(self)
+        data['type'] = self.type
+        return data
+
+
+@dataclass
+class HostEvent(ScanEvent):
+    """مضيف تم تحديده للفحص"""
+
+    type = 'host'
+
+    host: str
+    hostnames: list = field(default_factory=list)
+
+
+@dataclass
+class PortEvent(ScanEvent):
+    """منفذ تم اكتشافه على مضيف مع خدمته إن عُرفت"""
+
+    type = 'port'
+
+    host: str
+    port: int
+    state: str
+    service: str = ''
+    version: str = ''
+
+
+@dataclass
+class ServiceEvent(ScanEvent):
+    """خدمة ويب تم اكتشافها"""
+
+    type = 'service'
+
+    host: str
+    port: int
+    url: str
+    scheme: str
+    status: int
+    server: str = ''
+    title: str = ''
+
+
+@dataclass
+class FindingEvent(ScanEvent):
+    """نتيجة فحص ثغرة (vulnerable=False للنتائج المعلوماتية)"""
+
+    type = 'finding'
+
+    check: str
+    host: str
+    port: int
+    vulnerable: bool
+    details: str = ''
+    result: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_result(cls, check, result):
+        """إنشاء الحدث من قاموس نتيجة الفاحص"""
+        host, port = result.get('host'), result.get('port')
+        if result.get('url'):
+            parsed = urlparse(result['url'])
+            host = host or parsed.hostname
+            port = port or parsed.port or _DEFAULT_PORTS.get(parsed.scheme)
+
+        return cls(
+            check=check,
+            host=host,
+            port=port,
+            vulnerable=result.get('vulnerable', False),
+            details=result.get('details', ''),
+            result=result
+        )
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة الإخراج غير المتزامن وشريط التقدم لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+
+# أسماء المراحل المعروضة في شريط التقدم
+STAGE_LABELS = {
+    'ports': 'فحص المنافذ',
+    'services': 'التعرف على الخدمات',
+    'web_services': 'اكتشاف خدمات الويب',
+    'wordpress': 'فحص WordPress',
+    'wordpress_plugins': 'تعداد إضافات WordPress',
+    'wordpress_themes': 'تعداد قوالب WordPress',
+    'craftcms': 'فحص Craft CMS',
+    'smb': 'فحص SMB',
+    'zyxel': 'فحص Zyxel'
+}
+
+
+class ConsoleOutput:
+    """واجهة متوافقة مع console.print تضع الرسائل في طابور يعرضها خيط واحد على دفعات
+
+    خيوط الفحص لا تنتظر قفل الطرفية ولا تكلفة التنسيق، والخيط العارض يجمع كل ما
+    وصل منذ آخر رسم ويكتبه دفعة واحدة بمعدل لا يتجاوز refresh_interval.
+    """
+
+    def __init__(self, refresh_interval=0.1):
+        self.refresh_interval = refresh_interval
+        self.quiet = False
+        self._muted = 0
+        self._mute_lock = threading.Lock()
+        self._console = Console()
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._progress = None
+        self._budget = None
+        self._tasks = {}
+
+    def print(self, *objects, **kwargs):
+        """إضافة رسالة إلى طابور العرض (لا تنتظر الطباعة)"""
+        if self.quiet or self._muted:
+            return
+        self._ensure_started()
+        self._queue.put(('print', objects, kwargs))
+
+    def track(self, budget):
+        """عرض شريط تقدم لكل مرحلة بحسب وحدات العمل المخطط لها والمنجزة في ScanBudget"""
+        if self.quiet or self._muted:
+            return
+        self._ensure_started()
+        self._queue.put(('track', budget, None))
+
+    def untrack(self):
+        """إخفاء شريط التقدم بعد عرض حالته النهائية"""
+        if self._thread is not None:
+            self._queue.put(('untrack', None, None))
+
+    @contextmanager
+    def muted(self):
+        """كتم الإخراج مؤقتًا طوال الكتلة دون تغيير quiet (يقبل التداخل من عدة خيوط)
+
+        الكتم يشمل العملية كلها لا الخيط المستدعي فقط: الطرفية مشتركة، وخيوط الفحص
+        الفرعية لا ترث سياق مستدعيها، فتُكتم أيضًا رسائل أي فحص آخر يعمل في الوقت نفسه.
+        """
+        with self._mute_lock:
+            self._muted += 1
+        try:
+            yield
+        finally:
+            with self._mute_lock:
+                self._muted -= 1
+
+    def flush(self, timeout=5):
+        """انتظار عرض جميع الرسائل الموجودة في الطابور"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(('flush', done, None))
+        done.wait(timeout)
+
+    def _ensure_started(self):
+        """تشغيل الخيط العارض عند أول استخدام"""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    thread = threading.Thread(target=self._run, name="ScanSayer-Console", daemon=True)
+                    thread.start()
+                    self._thread = thread
+
+    def _run(self):
+        """حلقة العرض: سحب كل الرسائل المتاحة وعرضها دفعة واحدة ثم تحديث شريط التقدم"""
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.refresh_interval)]
+            except queue.Empty:
+                batch = []
+
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            started = time.monotonic()
+            flushed = [value for kind, value, _ in batch if kind == 'flush']
+            try:
+                # وضع التخزين المؤقت في rich يكتب الدفعة كاملة إلى الطرفية مرة واحدة
+                with self._console:
+                    for kind, value, kwargs in batch:
+                        self._render(kind, value, kwargs)
+                self._refresh_progress()
+            except Exception:
+                # خطأ في الكتابة إلى الطرفية نفسها لا يجوز أن يوقف الخيط العارض الوحيد
+                pass
+            finally:
+                for done in flushed:
+                    done.set()
+
+            # الحد من معدل الرسم: الرسائل التي تصل خلال هذه الفترة تُجمع في الدفعة التالية
+            if batch:
+                time.sleep(max(0.0, self.refresh_interval - (time.monotonic() - started)))
+
+    def _render(self, kind, value, kwargs):
+        """عرض عنصر واحد من الطابور دون أن يوقف خطؤه بقية الدفعة"""
+        try:
+            if kind == 'print':
+                self._console.print(*value, **kwargs)
+            elif kind == 'track':
+                self._start_progress(value)
+            elif kind == 'untrack':
+                self._stop_progress()
+        except Exception:
+            if kind == 'print':
+                # وسوم غير صالحة (مثل عنوان صفحة من الهدف يحتوي [/x]): طباعة النص كما هو
+                try:
+                    self._console.print(*value, **{**kwargs, 'markup': False})
+                except Exception:
+                    pass
+
+    def _start_progress(self, budget):
+        """بدء عرض التقدم لمهلة فحص جديدة"""
+        self._stop_progress()
+        self._budget = budget
+        self._tasks = {}
+        self._progress = Progress(
+            TextColumn("[cyan]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=self._console,
+            auto_refresh=False
+        )
+        self._progress.start()
+
+    def _stop_progress(self):
+        """إيقاف عرض التقدم"""
+        if self._progress is not None:
+            self._refresh_progress()
+            self._progress.stop()
+            self._progress = None
+            self._budget = None
+
+    def _refresh_progress(self):
+        """نسخ عدادات المراحل من ScanBudget إلى أشرطة التقدم وإعادة الرسم"""
+        if self._progress is None:
+            return
+
+        for stage, entry in self._budget.coverage()['stages'].items():
+            task = self._tasks.get(stage)
+            if task is None:
+                task = self._progress.add_task(STAGE_LABELS.get(stage, stage), total=entry['planned'])
+                self._tasks[stage] = task
+            self._progress.update(task, total=entry['planned'], completed=entry['completed'])
+        self._progress.refresh()
+
+
+# الإخراج المشترك بين جميع الوحدات
+console = ConsoleOutput()
+atexit.register(console.flush)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة تعداد المسارات المتوازي مع كشف صفحات 404 الزائفة لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import hashlib
+import threading
+import uuid
+
+import requests
+from fake_useragent import UserAgent
+
+from .connection_pool import http_pool
+from .profiler import traced
+from .scheduler import ScanBudget, run_prioritized
+
+# إعداد وكيل المستخدم العشوائي
+ua = UserAgent()
+
+# قوائم افتراضية صغيرة لإضافات وقوالب WordPress الشائعة (يمكن استبدالها بقوائم أكبر من ملف)
+WORDPRESS_PLUGINS = [
+    'templateinvaders', 'akismet', 'contact-form-7', 'woocommerce', 'elementor', 'wordpress-seo',
+    'jetpack', 'wpforms-lite', 'classic-editor', 'really-simple-ssl', 'wordfence', 'updraftplus',
+    'all-in-one-seo-pack', 'litespeed-cache', 'duplicate-post', 'wp-file-manager', 'revslider',
+    'js_composer', 'wp-super-cache', 'w3-total-cache', 'all-in-one-wp-migration', 'duplicator',
+    'advanced-custom-fields', 'google-site-kit', 'redirection', 'loginizer', 'wp-mail-smtp',
+    'ninja-forms', 'gravityforms', 'mailchimp-for-wp', 'tinymce-advanced', 'wp-statistics'
+]
+
+WORDPRESS_THEMES = [
+    'twentytwentyfour', 'twentytwentythree', 'twentytwentytwo', 'twentytwentyone', 'twentytwenty',
+    'twentynineteen', 'twentyseventeen', 'astra', 'hello-elementor', 'generatepress', 'oceanwp',
+    'kadence', 'neve', 'divi', 'avada', 'storefront', 'sydney', 'hestia'
+]
+
+# الحالات التي تدل على وجود المسار عندما لا تطابق خط الأساس
+_FOUND_STATUSES = (200, 204, 301, 302, 307, 308, 401, 403)
+
+# أقصى حجم يُقرأ من كل استجابة لحساب البصمة
+_MAX_BODY = 64 * 1024
+
+
+def load_wordlist(path):
+    """قراءة قائمة كلمات من ملف (سطر لكل كلمة مع تجاهل التعليقات)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        words = [line.strip().strip('/') for line in f]
+    return list(dict.fromkeys(word for word in words if word and not word.startswith('#')))
+
+
+def _signature(response, name):
+    """بصمة الاستجابة (الحالة، الطول، التجزئة) بعد حذف الاسم المطلوب إن انعكس في المحتوى"""
+    body = response.raw.read(_MAX_BODY, decode_content=True) or b''
+    response.close()
+    body = body.replace(name.encode('utf-8', 'replace'), b'')
+    return response.status_code, len(body), hashlib.sha256(body).hexdigest()
+
+
+class PathEnumerator:
+    """تعداد أسماء تحت مجلد على خادم ويب بالتوازي مع استبعاد الردود المطابقة لصفحة 404 الزائفة
+
+    يُتعلم خط الأساس مرة واحدة لكل (موقع، مجلد) بطلب اسم عشوائي غير موجود، وإذا
+    بدا أن الخادم يجيب على كل الأسماء يتوقف التعداد مبكرًا ويُعتبر غير موثوق.
+    """
+
+    def __init__(self, threads=32, budget=None, min_samples=20, max_hit_ratio=0.5, http=None):
+        self.threads = threads
+        self.budget = budget or ScanBudget()
+        self.http = http or http_pool
+        self.min_samples = min_samples
+        self.max_hit_ratio = max_hit_ratio
+        self.unreliable = set()
+        self._baselines = {}
+        self._lock = threading.Lock()
+
+    def _request(self, url, name, headers):
+        """طلب مسار واحد وإرجاع بصمته"""
+        response = self.http.get(url, headers=headers, timeout=self.budget.timeout(10), verify=False,
+                             allow_redirects=False, stream=True)
+        return _signature(response, name)
+
+    def baseline(self, base_url, directory):
+        """بصمة الرد على اسم عشوائي غير موجود في المجلد (تُحسب مرة واحدة)"""
+        key = (base_url, directory)
+        with self._lock:
+            if key in self._baselines:
+                return self._baselines[key]
+
+        name = uuid.uuid4().hex
+        try:
+            signature = self._request(f"{base_url}/{directory}/{name}/", name, {'User-Agent': ua.random})
+        except requests.exceptions.RequestException:
+            signature = None
+
+        with self._lock:
+            return self._baselines.setdefault(key, signature)
+
+    def _is_hit(self, signature, baseline):
+        """هل تدل البصمة على وجود المسار"""
+        status, length, digest = signature
+        if status not in _FOUND_STATUSES:
+            return False
+        if baseline is None:
+            return True
+
+        base_status, base_length, base_digest = baseline
+        if status != base_status:
+            return True
+        # نفس الحالة: يُعتبر موجودًا فقط إذا اختلف المحتوى عن صفحة الخطأ الزائفة
+        return digest != base_digest and length != base_length
+
+    def _answers_everything(self, completed, hits, total):
+        """هل نسبة الأسماء الموجودة مرتفعة إلى حد لا يُصدق (القوائم القصيرة تُقيَّم عند اكتمالها)"""
+        if completed < min(self.min_samples, total):
+            return False
+        return hits > max(completed * self.max_hit_ratio, 3)
+
+    @traced('PathEnumerator.enumerate', args=('base_url', 'directory'))
+    def enumerate(self, base_url, directory, names, stage='paths'):
+        """إرجاع قائمة بالأسماء الموجودة: [{'name', 'url', 'status'}]"""
+        baseline = self.baseline(base_url, directory)
+        # وكيل مستخدم واحد لكل تعداد كما يفعل المتصفح، فاختياره عشوائيًا لكل طلب مكلف
+        headers = {'User-Agent': ua.random}
+        probes = [(f"{base_url}/{directory}/{name}/", name, headers) for name in names]
+
+        found = []
+        completed = 0
+        for (url, name, _), signature, error in run_prioritized(self._request, probes, self.threads, self.budget, stage):
+            completed += 1
+            if error is None and self._is_hit(signature, baseline):
+                found.append({'name': name, 'url': url, 'status': signature[0]})
+
+            # الخادم يجيب بنجاح على معظم الأسماء: النتائج غير موثوقة ولا فائدة من المتابعة
+            if self._answers_everything(completed, len(found), len(probes)):
+                self.unreliable.add((base_url, directory))
+                # الإيقاف مقصود، فتُحتسب بقية المسارات منجزة حتى لا يظهر التقرير كجزئي
+                self.budget.done(stage, len(probes) - completed)
+                return []
+
+        return sorted(found, key=lambda item: item['name'])
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التخزين المضغوط لنتائج فحص المنافذ لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+
+class PortStore:
+    """مخزن حالة المنافذ: خريطة بتات (مضيف × منفذ) للمنافذ المفتوحة مع جدول جانبي للنصوص"""
+
+    def __init__(self, hosts=()):
+        self._hosts = []
+        self._host_index = {}
+        self._capacity = 0
+        # لكل منفذ عمود من البتات، بت لكل مضيف
+        self._columns = {}
+        # النصوص المتكررة (الحالة، الخدمة، الإصدار) تُخزن مرة واحدة ويُشار إليها برقم
+        self._strings = ['']
+        self._string_ids = {'': 0}
+        # الخدمة الافتراضية لكل منفذ، والاستثناءات فقط تُخزن في الجدول الجانبي {رقم المضيف: {المنفذ: ...}}
+        self._default_service = {}
+        self._details = {}
+
+        for host in hosts:
+            self.add_host(host)
+
+    def _intern(self, value):
+        """تحويل النص إلى رقم مرجعي مشترك"""
+        value = value or ''
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def add_host(self, host):
+        """تسجيل مضيف وإرجاع رقمه في الفهرس"""
+        index = self._host_index.get(host)
+        if index is not None:
+            return index
+
+        index = len(self._hosts)
+        self._hosts.append(host)
+        self._host_index[host] = index
+
+        # توسيع جميع الأعمدة عند تجاوز السعة (مضاعفة لتقليل النسخ)
+        if index >= self._capacity:
+            self._capacity = max(64, self._capacity * 2)
+            size = (self._capacity + 7) // 8
+            for column in self._columns.values():
+                column.extend(bytes(size - len(column)))
+        return index
+
+    def _column(self, port):
+        """عمود البتات الخاص بمنفذ (يُنشأ عند الحاجة)"""
+        column = self._columns.get(port)
+        if column is None:
+            column = bytearray((self._capacity + 7) // 8)
+            self._columns[port] = column
+        return column
+
+    def add(self, host, port, state='open', service='', version=''):
+        """تسجيل نتيجة منفذ لمضيف"""
+        index = self.add_host(host)
+        column = self._column(port)
+
+        if state == 'open':
+            column[index >> 3] |= 1 << (index & 7)
+        else:
+            column[index >> 3] &= ~(1 << (index & 7)) & 0xff
+
+        default = self._default_service.setdefault(port, service)
+        if state == 'open' and service == default and not version:
+            host_details = self._details.get(index)
+            if host_details:
+                host_details.pop(port, None)
+        else:
+            details = (self._intern(state), self._intern(service), self._intern(version))
+            self._details.setdefault(index, {})[port] = details
+
+    def is_open(self, host, port):
+        """هل المنفذ مفتوح على المضيف"""
+        index = self._host_index.get(host)
+        column = self._columns.get(port)
+        if index is None or column is None:
+            return False
+        return bool(column[index >> 3] & (1 << (index & 7)))
+
+    def hosts_with_port(self, port):
+        """جميع المضيفين الذين لديهم المنفذ المحدد مفتوحًا"""
+        column = self._columns.get(port)
+        if column is None:
+            return
+
+        for byte_index, byte in enumerate(column):
+            if not byte:
+                continue
+            base = byte_index << 3
+            for bit in range(8):
+                if byte & (1 << bit) and base + bit < len(self._hosts):
+                    yield self._hosts[base + bit]
+
+    def open_ports(self, host):
+        """قائمة المنافذ المفتوحة لمضيف مرتبة تصاعديًا"""
+        index = self._host_index.get(host)
+        if index is None:
+            return []
+        byte_index, mask = index >> 3, 1 << (index & 7)
+        return sorted(port for port, column in self._columns.items() if column[byte_index] & mask)
+
+    def port_info(self, host, port):
+        """معلومات منفذ واحد بالتنسيق القديم {port, state, service, version}"""
+        index = self._host_index.get(host)
+        if index is None or port not in self._columns:
+            return None
+
+        details = self._details.get(index, {}).get(port)
+        if details:
+            state, service, version = (self._strings[i] for i in details)
+        elif self.is_open(host, port):
+            state, service, version = 'open', self._default_service[port], ''
+        else:
+            return None
+
+        return {'port': port, 'state': state, 'service': service, 'version': version}
+
+    def get(self, host, default=None):
+        """قائمة قواميس المنافذ لمضيف واحد (متوافقة مع التنسيق القديم)"""
+        if host not in self._host_index:
+            return default
+
+        ports = set(self.open_ports(host))
+        ports.update(self._details.get(self._host_index[host], ()))
+        return [self.port_info(host, port) for port in sorted(ports)]
+
+    def __getitem__(self, host):
+        ports = self.get(host)
+        if ports is None:
+            raise KeyError(host)
+        return ports
+
+    def __contains__(self, host):
+        return host in self._host_index
+
+    def __iter__(self):
+        return iter(self._hosts)
+
+    def __len__(self):
+        return len(self._hosts)
+
+    def items(self):
+        """أزواج (المضيف، قائمة المنافذ) تُبنى عند الطلب لكل مضيف"""
+        for host in self._hosts:
+            yield host, self.get(host)
+
+    def to_dict(self):
+        """تحويل المخزن إلى قاموس {المضيف: [المنافذ]} لحفظ التقارير"""
+        return dict(self.items())
+
+
+def json_default(obj):
+    """دالة تحويل لـ json.dump تدعم الكائنات التي توفر to_dict"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التتبع وقياس الأداء لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .output import console
+
+
+class Tracer:
+    """مسجل فترات التتبع بتنسيق Chrome Trace / Perfetto"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._named_threads = set()
+
+    def enable(self):
+        """تفعيل التسجيل وإعادة ضبط نقطة البداية"""
+        with self._lock:
+            self.events = []
+            self._named_threads = set()
+            self._origin = time.perf_counter()
+        self.enabled = True
+
+    def disable(self):
+        """إيقاف التسجيل"""
+        self.enabled = False
+
+    def _timestamp(self):
+        """الوقت الحالي بالميكروثانية منذ بدء التسجيل"""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name, category='scan', **args):
+        """تسجيل فترة زمنية حول كتلة من الكود"""
+        if not self.enabled:
+            yield
+            return
+
+        start = self._timestamp()
+        try:
+            yield
+        finally:
+            self._record(name, category, start, self._timestamp() - start, args)
+
+    def _record(self, name, category, start, duration, args):
+        """إضافة حدث مكتمل إلى السجل"""
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(start, 3),
+            'dur': round(duration, 3),
+            'pid': os.getpid(),
+            'tid': thread.ident,
+            'args': {key: str(value) for key, value in args.items()}
+        }
+
+        with self._lock:
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self.events.append({
+                    'name': 'thread_name',
+                    'ph': 'M',
+                    'pid': os.getpid(),
+                    'tid': thread.ident,
+                    'args': {'name': thread.name}
+                })
+            self.events.append(event)
+
+    def save(self, output_file):
+        """حفظ الخط الزمني بتنسيق JSON متوافق مع chrome://tracing و Perfetto"""
+        try:
+            with self._lock:
+                trace = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+
+            console.print(f"\n[bold green]تم حفظ ملف التتبع في: {output_file}[/bold green]")
+            return True
+        except Exception as e:
+            console.print(f"\n[bold red]خطأ في حفظ ملف التتبع: {str(e)}[/bold red]")
+            return False
+
+
+class CPUSampler:
+    """مُعايِن دوري لمكدسات الخيوط لإنتاج ملف أداء CPU بتنسيق folded"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """بدء أخذ العينات في خيط خلفي"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ScanSayer-Sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """إيقاف أخذ العينات"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """حلقة أخذ العينات"""
+        own_ident = threading.get_ident()
+        names = {}
+
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+
+                stack.append(names.get(ident, str(ident)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def save(self, output_file):
+        """حفظ العينات بتنسيق folded المناسب لأدوات flamegraph و speedscope"""
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+
+            console.print(f"[bold green]تم حفظ ملف أداء CPU في: {output_file}[/bold green]")
+            return True
+        except Exception as e:
+            console.print(f"[bold red]خطأ في حفظ ملف أداء CPU: {str(e)}[/bold red]")
+            return False
+
+
+# المسجل المشترك بين جميع الوحدات
+tracer = Tracer()
+
+
+def traced(name, category='probe', args=()):
+    """مُزخرف لتسجيل فترة حول كل استدعاء للدالة
+
+    args أسماء الوسائط القصيرة (مثل host و port و url) التي تُسجل مع الفترة؛ بقية
+    الوسائط (محتوى HTML، المقابس، الاتصالات) لا تُسجل حتى لا يتضخم ملف التتبع.
+    """
+    def decorator(func):
+        parameters = list(inspect.signature(func).parameters)
+        positions = [(arg, parameters.index(arg)) for arg in args]
+
+        @functools.wraps(func)
+        def wrapper(*call_args, **kwargs):
+            if not tracer.enabled:
+                return func(*call_args, **kwargs)
+
+            span_args = {}
+            for arg, index in positions:
+                if index < len(call_args):
+                    span_args[arg] = call_args[index]
+                elif arg in kwargs:
+                    span_args[arg] = kwargs[arg]
+            with tracer.span(name, category, **span_args):
+                return func(*call_args, **kwargs)
+        return wrapper
+    return decorator
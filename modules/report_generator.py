@@ -10,11 +10,11 @@
 import json
 import os
 from datetime import datetime
-from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
-# تهيئة وحدة الطباعة الغنية
-console = Console()
+from .output import console
+from .port_store import json_default
 
 class ReportGenerator:
     """فئة إنشاء التقارير"""
@@ -52,6 +52,19 @@ class ReportGenerator:
         
         return count
     
+    def _coverage_lines(self):
+        """أسطر تغطية المراحل غير المكتملة (قائمة فارغة إذا اكتمل الفحص)"""
+        coverage = self.results.get('coverage')
+        if not coverage or coverage.get('complete', True):
+            return []
+        
+        lines = []
+        for stage, entry in coverage.get('stages', {}).items():
+            planned, completed = entry['planned'], entry['completed']
+            percent = (completed / planned * 100) if planned else 100.0
+            lines.append(f"{stage}: {completed}/{planned} ({percent:.0f}%)")
+        return lines
+    
     def display_console_report(self):
         """عرض تقرير في وحدة التحكم"""
         console.print("\n[bold green]===== تقرير الفحص =====[/bold green]")
@@ -60,6 +73,12 @@ class ReportGenerator:
         console.print(f"[bold]المدة:[/bold] {self.duration:.2f} ثانية")
         console.print(f"[bold]عدد الثغرات المكتشفة:[/bold] {self.vuln_count}")
         
+        coverage_lines = self._coverage_lines()
+        if coverage_lines:
+            console.print("[bold yellow]تقرير جزئي: انتهت المهلة الزمنية قبل اكتمال الفحص[/bold yellow]")
+            for line in coverage_lines:
+                console.print(f"  [yellow]{line}[/yellow]")
+        
         if self.vuln_count > 0:
             table = Table(title="الثغرات المكتشفة")
             table.add_column("النوع", style="cyan")
@@ -74,12 +93,12 @@ class ReportGenerator:
             # Craft CMS
             for vuln in self.results.get('craftcms', []):
                 if vuln.get('vulnerable', False):
-                    table.add_row("Craft CMS", vuln['url'], f"{vuln['details']} (الإصدار {vuln['version']})")
+                    table.add_row("Craft CMS", vuln['url'], f"{vuln['details']} (الإصدار {escape(vuln['version'])})")
             
             # SMB
             for vuln in self.results.get('smb', []):
                 if vuln.get('vulnerable', False):
-                    table.add_row("SMB", f"{vuln['host']} ({vuln['share']})", vuln['details'])
+                    table.add_row("SMB", f"{vuln['host']} ({escape(vuln['share'])})", vuln['details'])
             
             # Zyxel
             for vuln in self.results.get('zyxel', []):
@@ -102,7 +121,7 @@ class ReportGenerator:
             }
             
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=4)
+                json.dump(output_data, f, ensure_ascii=False, indent=4, default=json_default)
             
             console.print(f"\n[bold green]تم حفظ التقرير في: {output_file}[/bold green]")
             return True
@@ -148,6 +167,16 @@ class ReportGenerator:
                 </div>
             """
             
+            coverage_lines = self._coverage_lines()
+            if coverage_lines:
+                html_content += """
+                <div class="summary">
+                    <h2>تقرير جزئي: انتهت المهلة الزمنية قبل اكتمال الفحص</h2>
+                """
+                for line in coverage_lines:
+                    html_content += f"<p>{line}</p>\n"
+                html_content += "</div>\n"
+            
             if self.vuln_count > 0:
                 html_content += """
                 <div class="vulnerabilities">
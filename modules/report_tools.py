@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة دمج تقارير الفحص ومقارنتها لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import json
+import re
+
+from .events import FindingEvent
+
+# مفاتيح نتائج الثغرات في التقرير
+FINDING_CHECKS = ('wordpress', 'craftcms', 'smb', 'zyxel')
+
+# الحقول التي تميز نتيجتين من الفحص نفسه على المنفذ نفسه (إضافة WordPress، مشاركة SMB)
+_ITEM_FIELDS = ('plugin', 'share')
+
+# نتائج SMB في التقارير القديمة لا تحمل منفذًا، وكانت تُفحص دائمًا على 445
+_LEGACY_SMB_PORT = 445
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# أحرف قد تكمل رقمًا مقطوعًا عند حد الجزء (مثل 12 ثم .34)
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class _JSONStream:
+    """قارئ JSON تدريجي يقرأ الملف على أجزاء ويفك قيمة صغيرة واحدة في كل مرة
+
+    الحاويات الكبيرة (مثل جدول المنافذ) تُعبر عنصرًا عنصرًا دون تحميلها كاملة،
+    فتبقى الذاكرة محدودة بحجم الجزء وأكبر عنصر منفرد.
+    """
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """قراءة جزء إضافي وحذف ما تمت معالجته من المخزن"""
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def _error(self, message):
+        return ValueError(f"{message} (قرب: {self.buffer[self.pos:self.pos + 40]!r})")
+
+    def peek(self):
+        """أول حرف غير فارغ دون استهلاكه ('' عند نهاية الملف)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """استهلاك حرف بنيوي متوقع"""
+        if self.peek() != char:
+            raise self._error(f"تنسيق JSON غير متوقع: كان المتوقع {char!r}")
+        self.pos += 1
+
+    def _separator(self, closing):
+        """استهلاك الفاصلة أو قوس الإغلاق بعد عنصر، وإرجاع True عند الإغلاق"""
+        char = self.peek()
+        self.pos += 1
+        if char == closing:
+            return True
+        if char != ',':
+            self.pos -= 1
+            raise self._error("تنسيق JSON غير متوقع")
+        return False
+
+    def value(self):
+        """فك قيمة كاملة من الموضع الحالي"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+                # الرقم قد يكون مقطوعًا ما دامت بقية المخزن كلها أحرفًا يمكن أن تكمله،
+                # وأي قيمة أخرى تنتهي عند آخر المخزن قد تكون مقطوعة، فتُقرأ بقيتها أولاً
+                number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                truncated = _NUMBER_TAIL.fullmatch(self.buffer, end) if number else end == len(self.buffer)
+                if not truncated or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def items(self):
+        """مفاتيح كائن بالترتيب؛ على المستدعي قراءة قيمة كل مفتاح أو تخطيها قبل المتابعة"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self._separator('}'):
+                return
+
+    def elements(self):
+        """عناصر مصفوفة بالترتيب؛ على المستدعي قراءة كل عنصر أو تخطيه قبل المتابعة"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self._separator(']'):
+                return
+
+    def skip(self):
+        """تخطي القيمة الحالية"""
+        char = self.peek()
+        if char not in ('{', '['):
+            self.value()
+            return
+
+        # الحاوية الموجودة كاملة في المخزن تُتخطى بسرعة المحلل المدمج
+        try:
+            _, end = self._decoder.raw_decode(self.buffer, self.pos)
+            if end < len(self.buffer):
+                self.pos = end
+                return
+        except json.JSONDecodeError:
+            pass
+
+        for _ in (self.items() if char == '{' else self.elements()):
+            self.skip()
+
+
+def finding_key(check, result):
+    """مفتاح النتيجة (المضيف، المنفذ، الفحص) المستخدم في الدمج والمقارنة"""
+    event = FindingEvent.from_result(check, result)
+    item = next((result[field] for field in _ITEM_FIELDS if result.get(field)), None)
+    port = event.port
+    if port is None and check == 'smb':
+        port = _LEGACY_SMB_PORT
+    return (event.host, port, f"{check}:{item}" if item else check)
+
+
+def iter_findings(path):
+    """قراءة تقرير JSON تدريجيًا وإرجاع ('target', الهدف) أو ('finding', الفحص، النتيجة) للثغرات فقط"""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f)
+        for key in stream.items():
+            if key == 'target':
+                yield 'target', stream.value(), None
+            elif key == 'results':
+                for check in stream.items():
+                    if check not in FINDING_CHECKS:
+                        stream.skip()
+                        continue
+                    for _ in stream.elements():
+                        result = stream.value()
+                        if isinstance(result, dict) and result.get('vulnerable', False):
+                            yield 'finding', check, result
+            else:
+                stream.skip()
+
+
+class FindingSet:
+    """نتائج عدة تقارير مفهرسة بالمفتاح (المضيف، المنفذ، الفحص)
+
+    الذاكرة تتناسب مع عدد النتائج المميزة لا مع حجم الملفات، وعند تكرار المفتاح
+    تُعتمد النتيجة من آخر تقرير مضاف.
+    """
+
+    def __init__(self, paths=()):
+        self.findings = {}
+        self.targets = []
+        for path in paths:
+            self.add_report(path)
+
+    def add_report(self, path):
+        """إضافة نتائج تقرير واحد"""
+        for kind, first, second in iter_findings(path):
+            if kind == 'target':
+                if first not in self.targets:
+                    self.targets.append(first)
+            else:
+                self.findings[finding_key(first, second)] = (first, second)
+
+    def __len__(self):
+        return len(self.findings)
+
+    def keys(self):
+        """مفاتيح النتائج (تدعم عمليات المجموعات)"""
+        return self.findings.keys()
+
+    def to_results(self, keys=None):
+        """تحويل النتائج (أو جزء منها) إلى قاموس results بتنسيق التقرير"""
+        results = {check: [] for check in FINDING_CHECKS}
+        for key in sorted(self.findings if keys is None else keys, key=repr):
+            check, result = self.findings[key]
+            results[check].append(result)
+        return results
+
+
+def diff_reports(old_paths, new_paths):
+    """مقارنة تقارير قديمة بأخرى جديدة
+
+    تُرجع (الفروق، النتائج القديمة، النتائج الجديدة) حيث الفروق قاموس بمفاتيح
+    new و resolved و unchanged وقيمه بتنسيق results في التقرير.
+    """
+    old, new = FindingSet(old_paths), FindingSet(new_paths)
+    return {
+        'new': new.to_results(new.keys() - old.keys()),
+        'resolved': old.to_results(old.keys() - new.keys()),
+        'unchanged': new.to_results(new.keys() & old.keys())
+    }, old, new
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة خادم الفحص طويل التشغيل لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .connection_pool import http_pool, smb_pool
+from .output import console
+from .port_store import json_default
+
+
+class ScanCancelled(Exception):
+    """يُرفع عند إلغاء فحص قيد التنفيذ"""
+
+
+class ScanJob:
+    """مهمة فحص واحدة مع سجل أحداثها"""
+
+    def __init__(self, target, client='default', threads=10):
+        self.id = uuid.uuid4().hex[:12]
+        self.target = target
+        self.client = client
+        self.threads = threads
+        self.status = 'queued'
+        self.results = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.events = []
+        self.cancel_event = threading.Event()
+        self._cond = threading.Condition()
+
+    @property
+    def done(self):
+        """هل انتهت المهمة (بنجاح أو فشل أو إلغاء)"""
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def add_event(self, event_type, data=None):
+        """إضافة حدث جديد وإيقاظ المستمعين"""
+        with self._cond:
+            self.events.append({'type': event_type, 'time': time.time(), 'data': data})
+            self._cond.notify_all()
+
+    def set_status(self, status, **fields):
+        """تحديث حالة المهمة وتسجيلها كحدث"""
+        for key, value in fields.items():
+            setattr(self, key, value)
+        self.status = status
+        self.add_event('status', status)
+
+    def wait_events(self, position, timeout=15):
+        """انتظار أحداث بعد الموضع المحدد وإرجاعها"""
+        with self._cond:
+            if position >= len(self.events) and not self.done:
+                self._cond.wait(timeout)
+            return self.events[position:]
+
+    def to_dict(self, include_results=False):
+        """تحويل المهمة إلى قاموس قابل للتسلسل"""
+        data = {
+            'id': self.id,
+            'target': self.target,
+            'client': self.client,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'error': self.error
+        }
+        if include_results:
+            data['results'] = self.results
+        return data
+
+
+class ScanService:
+    """خادم فحص يجدول المهام بعدالة بين العملاء على عدد ثابت من العمال"""
+
+    def __init__(self, run_scan, workers=4, max_finished=1000, max_threads=50):
+        self.run_scan = run_scan
+        self.workers = workers
+        # الحد الأعلى لخيوط كل مهمة حتى لا يستهلك عميل واحد قدرة العمال المشتركة
+        self.max_threads = max_threads
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self._queues = OrderedDict()
+        self._cond = threading.Condition()
+        self._running = False
+        self._threads = []
+        self._server = None
+
+    def start(self):
+        """تشغيل خيوط العمال"""
+        self._running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ScanSayer-Worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """إيقاف العمال والخادم وإغلاق المجمعات"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        for job in list(self.jobs.values()):
+            if not job.done:
+                self.cancel(job.id)
+
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+        http_pool.close()
+        smb_pool.close()
+
+    def submit(self, target, client='default', threads=10):
+        """إضافة مهمة جديدة إلى طابور العميل"""
+        job = ScanJob(target, client, threads)
+        with self._cond:
+            self.jobs[job.id] = job
+            self._queues.setdefault(client, deque()).append(job)
+            self._prune()
+            self._cond.notify()
+        job.add_event('status', job.status)
+        return job
+
+    def get(self, job_id):
+        """الحصول على مهمة بمعرفها"""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        """قائمة جميع المهام المعروفة"""
+        return [job.to_dict() for job in list(self.jobs.values())]
+
+    def cancel(self, job_id):
+        """إلغاء مهمة في الطابور أو طلب إيقاف مهمة قيد التنفيذ"""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return job
+
+        job.cancel_event.set()
+        with self._cond:
+            queue = self._queues.get(job.client)
+            if queue and job in queue:
+                queue.remove(job)
+                job.set_status('cancelled', finished=time.time())
+        return job
+
+    def _next_job(self):
+        """اختيار المهمة التالية بالتناوب بين العملاء (round-robin)"""
+        while self._queues:
+            client, queue = next(iter(self._queues.items()))
+            if not queue:
+                del self._queues[client]
+                continue
+
+            job = queue.popleft()
+            # نقل العميل إلى آخر الدور حتى لا يحتكر عميل واحد العمال
+            self._queues.move_to_end(client)
+            return job
+        return None
+
+    def _prune(self):
+        """حذف أقدم المهام المنتهية عند تجاوز الحد"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def _worker(self):
+        """حلقة العامل: سحب المهام وتنفيذها"""
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and self._running:
+                    self._cond.wait()
+                    job = self._next_job()
+                if not self._running:
+                    return
+
+            self._execute(job)
+
+    def _execute(self, job):
+        """تنفيذ مهمة واحدة وتسجيل نتيجتها"""
+        job.set_status('running', started=time.time())
+        try:
+            results = self.run_scan(job)
+            job.set_status('completed', results=results, finished=time.time())
+        except ScanCancelled:
+            job.set_status('cancelled', finished=time.time())
+        except Exception as e:
+            job.set_status('failed', error=str(e), finished=time.time())
+
+    def serve(self, host='127.0.0.1', port=8765):
+        """تشغيل واجهة HTTP المحلية حتى الإيقاف"""
+        self.start()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        console.print(f"[bold green]خادم ScanSayer يعمل على http://{host}:{port}[/bold green]")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+
+def _make_handler(service):
+    """إنشاء معالج طلبات HTTP مرتبط بالخادم"""
+
+    class ScanRequestHandler(BaseHTTPRequestHandler):
+        """واجهة المهام: POST /jobs, GET /jobs, GET /jobs/<id>, DELETE /jobs/<id>, GET /jobs/<id>/events"""
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, data):
+            body = json.dumps(data, ensure_ascii=False, default=json_default).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self):
+            parts = [part for part in self.path.split('?')[0].split('/') if part]
+            if not parts or parts[0] != 'jobs':
+                return None, None, parts
+            job = service.get(parts[1]) if len(parts) > 1 else None
+            return parts, job, parts[2:]
+
+        def do_GET(self):
+            parts, job, rest = self._route()
+            if parts is None:
+                return self._send_json(404, {'error': 'not found'})
+            if len(parts) == 1:
+                return self._send_json(200, {'jobs': service.list_jobs()})
+            if job is None:
+                return self._send_json(404, {'error': 'job not found'})
+            if rest == ['events']:
+                return self._stream_events(job)
+            return self._send_json(200, job.to_dict(include_results=True))
+
+        def do_POST(self):
+            parts, _, _ = self._route()
+            if parts != ['jobs']:
+                return self._send_json(404, {'error': 'not found'})
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                target = request['target']
+                threads = int(request.get('threads', 10))
+            except (ValueError, KeyError, TypeError):
+                return self._send_json(400, {'error': 'expected JSON body with "target"'})
+
+            if threads < 1:
+                return self._send_json(400, {'error': '"threads" must be at least 1'})
+            threads = min(threads, service.max_threads)
+
+            # قراءة الأهداف من ملف (@path) متاحة لسطر الأوامر فقط
+            if not isinstance(target, str) or target.startswith('@'):
+                return self._send_json(400, {'error': 'target must be a host, CIDR or comma-separated list'})
+
+            job = service.submit(target, str(request.get('client', 'default')), threads)
+            return self._send_json(201, job.to_dict())
+
+        def do_DELETE(self):
+            parts, job, _ = self._route()
+            if parts is None or job is None:
+                return self._send_json(404, {'error': 'job not found'})
+            service.cancel(job.id)
+            return self._send_json(200, job.to_dict())
+
+        def _stream_events(self, job):
+            """بث الأحداث بتنسيق NDJSON حتى انتهاء المهمة"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+            self.end_headers()
+
+            position = 0
+            try:
+                while True:
+                    events = job.wait_events(position)
+                    for event in events:
+                        self.wfile.write(json.dumps(event, ensure_ascii=False, default=json_default).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                    position += len(events)
+                    if job.done and position >= len(job.events):
+                        break
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return ScanRequestHandler
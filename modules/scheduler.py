@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة جدولة الفحص حسب الأولوية والمهلة الزمنية لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+# المنافذ مرتبة حسب الخطورة المتوقعة: الأعلى أولاً
+HIGH_RISK_PORTS = [
+    445, 139, 3389, 22, 23, 21, 5900, 3306, 1433, 5432, 6379, 27017,
+    80, 443, 8080, 8443, 135, 111, 25, 110, 143, 993, 995, 1723, 53
+]
+
+_PORT_RANK = {port: rank for rank, port in enumerate(HIGH_RISK_PORTS)}
+
+
+def port_priority(port):
+    """ترتيب المنفذ في الجدولة (الأصغر يُفحص أولاً)"""
+    return _PORT_RANK.get(port, len(HIGH_RISK_PORTS) + port)
+
+
+class ScanBudget:
+    """مهلة الفحص الزمنية وأولويات المضيفين وسجل التغطية لكل مرحلة"""
+
+    def __init__(self, time_budget=None, cancel_event=None, priority_hosts=()):
+        self.time_budget = time_budget
+        self.cancel_event = cancel_event
+        self.priority_hosts = set(priority_hosts)
+        self.started = time.monotonic()
+        self.deadline = self.started + time_budget if time_budget else None
+        self._coverage = {}
+        self._lock = threading.Lock()
+
+    def expired(self):
+        """هل انتهت المهلة أو طُلب الإلغاء"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self):
+        """الوقت المتبقي بالثواني (None عند عدم وجود مهلة)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout(self, default, minimum=0.1):
+        """مهلة العملية الشبكية مقيدة بالوقت المتبقي"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(minimum, min(default, remaining))
+
+    def host_priority(self, host):
+        """المضيفون الذين ظهرت لديهم ثغرات سابقًا يُفحصون أولاً"""
+        return 0 if host in self.priority_hosts else 1
+
+    def probe_priority(self, item):
+        """مفتاح ترتيب زوج (المضيف، المنفذ)"""
+        host, port = item[0], item[1]
+        return (self.host_priority(host), port_priority(port))
+
+    def plan(self, stage, count):
+        """تسجيل عدد وحدات العمل المخطط لها في مرحلة"""
+        with self._lock:
+            entry = self._coverage.setdefault(stage, {'planned': 0, 'completed': 0})
+            entry['planned'] += count
+
+    def done(self, stage, count=1):
+        """تسجيل إنجاز وحدات عمل في مرحلة"""
+        with self._lock:
+            entry = self._coverage.setdefault(stage, {'planned': 0, 'completed': 0})
+            entry['completed'] += count
+
+    def coverage(self):
+        """ملخص التغطية لإدراجه في التقرير"""
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self._coverage.items()}
+
+        return {
+            'complete': all(entry['completed'] >= entry['planned'] for entry in stages.values()),
+            'time_budget': self.time_budget,
+            'elapsed': round(time.monotonic() - self.started, 2),
+            'stages': stages
+        }
+
+
+class RateLimiter:
+    """محدد معدل بخوارزمية دلو الرموز، آمن للاستخدام من عدة خيوط"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """انتظار توفر رمز ثم استهلاكه"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def run_prioritized(func, items, threads, budget, stage):
+    """تنفيذ func(*item) بالتوازي بترتيب العناصر مع التوقف عند انتهاء المهلة
+
+    يُبقي عددًا محدودًا من المهام قيد التنفيذ حتى لا تُنشأ ملايين المهام مسبقًا،
+    ويُرجع (العنصر، النتيجة، الخطأ) لكل عنصر اكتمل قبل انتهاء المهلة.
+    """
+    items = list(items)
+    budget.plan(stage, len(items))
+    iterator = iter(items)
+    limit = max(1, threads) * 2
+
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        pending = {}
+
+        def fill():
+            while len(pending) < limit and not budget.expired():
+                item = next(iterator, None)
+                if item is None:
+                    return
+                pending[executor.submit(func, *item)] = item
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, timeout=budget.remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    # انتهت المهلة: المهام الجارية محدودة بمهلها وتُهمل نتائجها
+                    break
+
+                for future in done:
+                    item = pending.pop(future)
+                    budget.done(stage)
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:
+                        yield item, None, e
+                fill()
+        finally:
+            # المهام التي لم تبدأ بعد تُلغى حتى لا ينفذها إغلاق المنفذ بعد انتهاء المهلة
+            # أو بعد توقف المستدعي عن القراءة
+            for future in pending:
+                future.cancel()
+
+
+def _finding_hosts(findings):
+    """استخراج المضيفين من نتائج الثغرات"""
+    for finding in findings:
+        if not finding.get('vulnerable', False):
+            continue
+        if finding.get('host'):
+            yield finding['host']
+        if finding.get('url'):
+            yield urlparse(finding['url']).hostname
+
+
+def load_priority_hosts(report_file):
+    """قراءة المضيفين الذين لديهم ثغرات من تقرير JSON سابق"""
+    with open(report_file, 'r', encoding='utf-8') as f:
+        results = json.load(f).get('results', {})
+
+    hosts = set()
+    for key in ('wordpress', 'craftcms', 'smb', 'zyxel'):
+        hosts.update(host for host in _finding_hosts(results.get(key, [])) if host)
+
+    # ربط أسماء المضيفين في الروابط بعناوين IP التي اكتُشفت عليها الخدمة
+    for web_service in results.get('web_services', []):
+        if urlparse(web_service.get('url', '')).hostname in hosts and web_service.get('host'):
+            hosts.add(web_service['host'])
+
+    return hosts
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة التعرف على الخدمات عبر التقاط الشعارات لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import codecs
+import re
+import socket
+import ssl
+
+from .profiler import traced
+from .tls_cache import tls_cache
+
+# قاعدة توقيعات مختصرة بأسلوب nmap-service-probes
+# Probe TCP <الاسم> q|<البيانات المرسلة>|
+# ports / sslports: المنافذ التي يُجرَّب عليها المسبار أولاً
+# match <الخدمة> m|<تعبير نمطي>|[si] [p/المنتج/] [v/الإصدار/] [i/معلومات/]
+SERVICE_PROBES = r"""
+Probe TCP NULL q||
+ports 21,22,23,25,110,143,587,993,995,3306,5900
+
+match ssh m|^SSH-([\d.]+)-OpenSSH[_-]([\w.]+)| p/OpenSSH/ v/$2/ i/protocol $1/
+match ssh m|^SSH-([\d.]+)-dropbear_([\w.]+)| p/Dropbear sshd/ v/$2/ i/protocol $1/
+match ssh m|^SSH-([\d.]+)-([^\r\n]+)| p/$2/ i/protocol $1/
+match ftp m|^220 \(vsFTPd ([\d.]+)\)| p/vsftpd/ v/$1/
+match ftp m|^220 ProFTPD ([\d.]+)| p/ProFTPD/ v/$1/
+match ftp m|^220[ -]FileZilla Server(?: version)? ([\w.-]+)| p/FileZilla ftpd/ v/$1/
+match ftp m|^220[ -]Microsoft FTP Service| p/Microsoft ftpd/
+match ftp m|^220[ -][^\r\n]*ftp|i
+match smtp m|^220 ([\w.-]+) ESMTP Postfix| p/Postfix smtpd/ i/$1/
+match smtp m|^220 ([\w.-]+) ESMTP Exim ([\d.]+)| p/Exim smtpd/ v/$2/ i/$1/
+match smtp m|^220 ([\w.-]+) Microsoft ESMTP MAIL Service| p/Microsoft Exchange smtpd/ i/$1/
+match smtp m|^220[ -]([\w.-]+) E?SMTP| i/$1/
+match pop3 m|^\+OK Dovecot| p/Dovecot pop3d/
+match pop3 m|^\+OK|
+match imap m|^\* OK \[CAPABILITY [^\]]*\] Dovecot| p/Dovecot imapd/
+match imap m|^\* OK|
+match mysql m|^.\0\0\0\x0a(\d[\w.-]*)\0|s p/MySQL/ v/$1/
+match mysql m|^.\0\0\0\xffj\x04Host '[^']*' is not allowed|s p/MySQL/ i/unauthorized/
+match vnc m|^RFB (\d{3})\.(\d{3})\n| p/VNC/ i/protocol $1.$2/
+match telnet m|^\xff[\xfb-\xfe]|
+
+Probe TCP GetRequest q|GET / HTTP/1.0\r\n\r\n|
+ports 80,81,631,3000,5000,8000,8008,8080,8081,8888,9000
+sslports 443,4443,8443,9443
+
+match http m|^HTTP/1\.[01] \d\d\d .*?\r\nServer: nginx/([\d.]+)|si p/nginx/ v/$1/
+match http m|^HTTP/1\.[01] \d\d\d .*?\r\nServer: Apache/([\d.]+)|si p/Apache httpd/ v/$1/
+match http m|^HTTP/1\.[01] \d\d\d .*?\r\nServer: Microsoft-IIS/([\d.]+)|si p/Microsoft IIS httpd/ v/$1/
+match http m|^HTTP/1\.[01] \d\d\d .*?\r\nServer: lighttpd/([\d.]+)|si p/lighttpd/ v/$1/
+match http m|^HTTP/1\.[01] \d\d\d .*?\r\nServer: ([^\r\n]+)|si p/$1/
+match http m|^HTTP/1\.[01] \d\d\d|
+match ssl m|^\x15\x03[\0-\x04]\0\x02\x02| i/TLS alert/
+
+Probe TCP DNSVersionBindReqTCP q|\0\x1e\0\x06\x01\0\0\x01\0\0\0\0\0\0\x07version\x04bind\0\0\x10\0\x03|
+ports 53
+
+match domain m|^\0.\0\x06[\x80-\x8f].{9}\x07version\x04bind\0\0\x10\0\x03\xc0\x0c\0\x10\0\x03.{7}([\x20-\x7e]+)|s v/$1/
+match domain m|^\0.\0\x06[\x80-\x8f]|s
+
+Probe TCP RPCCheck q|\x80\0\0\x28\x72\xfe\x1d\x13\0\0\0\0\0\0\0\x02\0\x01\x86\xa0\0\0\0\x02\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0\0|
+ports 111
+
+match rpcbind m|^\x80\0\0.\x72\xfe\x1d\x13\0\0\0\x01\0\0\0\0|s p/RPC #100000/
+
+Probe TCP GenericLines q|\r\n\r\n|
+ports 1723,3389
+
+match ms-wbt-server m|^\x03\0\0\x0b\x06\xd0\0\0\x124\0| p/Microsoft Terminal Services/
+match ms-wbt-server m|^\x03\0\0| p/Microsoft Terminal Services/
+"""
+
+# منافذ لا تُرسل إليها أي مسابير: خدماتها (MSRPC و NetBIOS و SMB) لا تبدأ بالكلام ولا تفهم
+# المسابير النصية، فيُعتمد اسم المنفذ المعروف ويتولى فاحص SMB التحقق الفعلي
+EXCLUDED_PORTS = {135, 139, 445}
+
+# المحارف التي تُنهي البادئة الحرفية للتعبير النمطي
+_REGEX_META = set('.^$*+?{}[]()|\\')
+
+# أسماء المتغيرات في قوالب p// و v// و i//
+_TEMPLATE_FIELDS = {'p': 'product', 'v': 'version', 'i': 'info'}
+
+
+class ServiceSignature:
+    """توقيع واحد لمطابقة استجابة خدمة"""
+
+    def __init__(self, service, pattern, flags, templates):
+        self.service = service
+        self.templates = templates
+        self.regex = re.compile(pattern, flags)
+        self.first_byte = self._first_byte(pattern, flags)
+
+    @staticmethod
+    def _first_byte(pattern, flags):
+        """استخراج أول بايت حرفي ثابت بعد ^ لاستخدامه في الفهرسة"""
+        if flags & re.IGNORECASE or not pattern.startswith(b'^') or len(pattern) < 2:
+            return None
+
+        char = pattern[1:2]
+        if char == b'\\':
+            escaped = pattern[2:3]
+            # \x00 وأمثاله تعني بايتًا محددًا، أما \d و \w فهي فئات
+            if escaped == b'0':
+                char, rest = b'\0', pattern[3:4]
+            elif escaped == b'x':
+                char, rest = bytes([int(pattern[3:5], 16)]), pattern[5:6]
+            elif escaped.isalnum() or not escaped:
+                return None
+            else:
+                char, rest = escaped, pattern[3:4]
+        elif char.decode('latin-1') in _REGEX_META:
+            return None
+        else:
+            rest = pattern[2:3]
+
+        # الحرف متبوع بمُكمِّم قد يجعله اختياريًا
+        if rest in (b'?', b'*', b'{'):
+            return None
+        return char[0]
+
+    def match(self, data):
+        """مطابقة الاستجابة وإرجاع معلومات الخدمة"""
+        result = self.regex.search(data)
+        if not result:
+            return None
+
+        info = {'service': self.service, 'product': '', 'version': '', 'info': ''}
+        for key, template in self.templates.items():
+            value = re.sub(
+                r'\$(\d)',
+                lambda m: (result.group(int(m.group(1))) or b'').decode('utf-8', 'replace'),
+                template
+            )
+            info[_TEMPLATE_FIELDS[key]] = value.strip()
+        return info
+
+
+class ServiceProbe:
+    """مسبار واحد مع توقيعاته المفهرسة"""
+
+    def __init__(self, name, payload):
+        self.name = name
+        self.payload = payload
+        self.ports = set()
+        self.ssl_ports = set()
+        self.signatures = []
+        self._index = None
+        self._unindexed = []
+
+    def add_signature(self, signature):
+        """إضافة توقيع مع إبطال الفهرس الحالي"""
+        self.signatures.append(signature)
+        self._index = None
+
+    def _build_index(self):
+        """فهرسة التوقيعات حسب أول بايت مع الحفاظ على ترتيب الأولوية"""
+        self._index = {}
+        self._unindexed = [s for s in self.signatures if s.first_byte is None]
+
+        for key in {s.first_byte for s in self.signatures if s.first_byte is not None}:
+            self._index[key] = [s for s in self.signatures if s.first_byte in (key, None)]
+
+    def match(self, data):
+        """مطابقة الاستجابة مع التوقيعات المرشحة فقط"""
+        if not data:
+            return None
+
+        if self._index is None:
+            self._build_index()
+
+        for signature in self._index.get(data[0], self._unindexed):
+            info = signature.match(data)
+            if info:
+                return info
+        return None
+
+
+def _split_delimited(text, start):
+    """قراءة قيمة محاطة بفاصل مثل m|...| وإرجاعها مع موضع النهاية"""
+    delimiter = text[start]
+    end = text.index(delimiter, start + 1)
+    return text[start + 1:end], end + 1
+
+
+def _decode_payload(value):
+    """تحويل تسلسلات الهروب (\\r \\n \\0 \\xHH) إلى بايتات"""
+    return codecs.escape_decode(value.encode('latin-1'))[0]
+
+
+def parse_service_probes(text):
+    """تحليل قاعدة التوقيعات إلى قائمة مسابير مُجمَّعة مسبقًا"""
+    probes = []
+    current = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        directive, _, rest = line.partition(' ')
+        if directive == 'Probe':
+            _, name, payload = rest.split(' ', 2)
+            value, _ = _split_delimited(payload, 1)
+            current = ServiceProbe(name, _decode_payload(value))
+            probes.append(current)
+        elif directive == 'ports':
+            current.ports.update(int(port) for port in rest.split(','))
+        elif directive == 'sslports':
+            current.ssl_ports.update(int(port) for port in rest.split(','))
+        elif directive == 'match':
+            service, _, spec = rest.partition(' ')
+            pattern, position = _split_delimited(spec, 1)
+
+            flags = 0
+            while position < len(spec) and spec[position] in 'si':
+                flags |= re.DOTALL if spec[position] == 's' else re.IGNORECASE
+                position += 1
+
+            templates = {}
+            for field in re.finditer(r'([pvi])/([^/]*)/', spec[position:]):
+                templates[field.group(1)] = field.group(2)
+
+            current.add_signature(ServiceSignature(service, pattern.encode('latin-1'), flags, templates))
+
+    return probes
+
+
+class ServiceProber:
+    """محرك التعرف على الخدمات فوق اتصال مفتوح مسبقًا"""
+
+    _probes = None
+
+    def __init__(self, timeout=2.0, banner_timeout=1.0, budget=None):
+        self.timeout = timeout
+        self.banner_timeout = banner_timeout
+        # مهل الانتظار تُقيد بالوقت المتبقي في مهلة الفحص إن وُجدت
+        self.budget = budget
+
+        # تحميل القاعدة مرة واحدة ومشاركتها بين جميع النسخ
+        if ServiceProber._probes is None:
+            ServiceProber._probes = parse_service_probes(SERVICE_PROBES)
+
+        self.probes = {probe.name: probe for probe in ServiceProber._probes}
+
+    @traced('ServiceProber.identify', args=('host', 'port'))
+    def identify(self, sock, host, port):
+        """التعرف على الخدمة باستخدام المقبس المتصل وإرجاع الاسم والإصدار"""
+        if port in EXCLUDED_PORTS:
+            return None
+
+        null_probe = self.probes['NULL']
+        probe = self._probe_for_port(port)
+
+        try:
+            # الخدمات التي تبدأ بالكلام (SSH, FTP, SMTP...) تكفيها قراءة الشعار
+            if port in null_probe.ports:
+                return self._match_all(self._receive(sock, self._timeout(self.banner_timeout)), null_probe)
+
+            # المنافذ غير المعروفة فقط تنتظر شعارًا ثم تُجرب طلب HTTP
+            if probe is None:
+                data = self._receive(sock, self._timeout(self.banner_timeout))
+                if data:
+                    return self._match_all(data, null_probe)
+                probe = self.probes['GetRequest']
+
+            if port in probe.ssl_ports:
+                # المقبس الأصلي يُفصل عند التغليف، لذا يُغلق المقبس المغلَّف هنا
+                with self._wrap_tls(sock, host) as tls_sock:
+                    tls_sock.sendall(probe.payload)
+                    data = self._receive(tls_sock, self._timeout(self.timeout))
+            else:
+                sock.sendall(probe.payload)
+                data = self._receive(sock, self._timeout(self.timeout))
+
+            info = self._match_all(data, probe)
+            if info and port in probe.ssl_ports and info['service'] == 'http':
+                info['service'] = 'https'
+            return info
+        except (OSError, ssl.SSLError):
+            return None
+
+    def _timeout(self, default):
+        """مهلة الانتظار مقيدة بالوقت المتبقي في مهلة الفحص"""
+        return self.budget.timeout(default) if self.budget else default
+
+    def _probe_for_port(self, port):
+        """اختيار المسبار المخصص للمنفذ إن وجد"""
+        for probe in self.probes.values():
+            if probe.name != 'NULL' and (port in probe.ports or port in probe.ssl_ports):
+                return probe
+        return None
+
+    def _wrap_tls(self, sock, host):
+        """تغليف المقبس المفتوح بطبقة TLS دون التحقق من الشهادة"""
+        return tls_cache.context.wrap_socket(sock, server_hostname=host)
+
+    def _receive(self, sock, timeout, limit=4096):
+        """قراءة الاستجابة الأولى من الخدمة"""
+        sock.settimeout(timeout)
+        try:
+            return sock.recv(limit)
+        except socket.timeout:
+            return b''
+
+    def _match_all(self, data, preferred):
+        """المطابقة مع المسبار المستخدم أولاً ثم مع بقية المسابير"""
+        if not data:
+            return None
+
+        info = preferred.match(data)
+        if info:
+            return info
+
+        for probe in self.probes.values():
+            if probe is not preferred:
+                info = probe.match(data)
+                if info:
+                    return info
+        return None
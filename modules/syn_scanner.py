@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة فحص المنافذ بحزم SYN (نصف مفتوح) لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import os
+import random
+import socket
+import struct
+import threading
+import time
+import zlib
+
+# أعلام TCP
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+
+def _checksum(data):
+    """مجموع التحقق القياسي للإنترنت (RFC 1071)"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+class SynScanner:
+    """إرسال حزم SYN على دفعات من مقبس خام واحد ومطابقة ردود SYN-ACK/RST في حلقة استقبال مستقلة
+
+    يعمل مع عناوين IPv4 فقط ويتطلب صلاحيات root (أو CAP_NET_RAW).
+    """
+
+    def __init__(self, timeout=1.0, retries=1, rate=5000, batch_size=256):
+        self.timeout = timeout
+        self.retries = retries
+        self.rate = rate
+        self.batch_size = batch_size
+        # منفذ مصدر واحد لكل فحص، والرقم التسلسلي مشتق من سر عشوائي للتحقق من أن الرد يخص حزمنا
+        self.source_port = random.randint(40000, 60000)
+        self._secret = os.urandom(8)
+        self._source_addresses = {}
+
+    @staticmethod
+    def available():
+        """هل يمكن فتح مقبس خام (صلاحيات كافية)"""
+        try:
+            socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP).close()
+            return True
+        except OSError:
+            return False
+
+    def _sequence(self, host, port):
+        """الرقم التسلسلي لحزمة SYN نحو (المضيف، المنفذ)"""
+        return zlib.crc32(self._secret + socket.inet_aton(host) + struct.pack('!H', port))
+
+    def _source_address(self, host):
+        """عنوان المصدر الذي ستُرسل منه الحزم نحو المضيف (لحساب مجموع التحقق)"""
+        address = self._source_addresses.get(host)
+        if address is None:
+            # اتصال UDP لا يرسل أي حزمة لكنه يحدد الواجهة المناسبة من جدول التوجيه
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.connect((host, 9))
+                address = probe.getsockname()[0]
+            self._source_addresses[host] = address
+        return address
+
+    def _packet(self, host, port):
+        """بناء ترويسة TCP لحزمة SYN مع خيار MSS (يضيف النظام ترويسة IP)"""
+        source = self._source_address(host)
+        header = struct.pack(
+            '!HHIIBBHHH',
+            self.source_port, port, self._sequence(host, port), 0,
+            6 << 4, TCP_SYN, 1024, 0, 0
+        ) + struct.pack('!BBH', 2, 4, 1460)
+
+        pseudo_header = socket.inet_aton(source) + socket.inet_aton(host) + struct.pack('!BBH', 0, socket.IPPROTO_TCP, len(header))
+        checksum = _checksum(pseudo_header + header)
+        return header[:16] + struct.pack('!H', checksum) + header[18:]
+
+    def _receive(self, sock, results, stop):
+        """حلقة استقبال الردود ومطابقتها مع الحزم المرسلة"""
+        while not stop.is_set():
+            try:
+                packet = sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            offset = (packet[0] & 0x0f) * 4
+            if len(packet) < offset + 14:
+                continue
+
+            source_port, destination_port, _, ack, flags = struct.unpack('!HHIIxB', packet[offset:offset + 14])
+            if destination_port != self.source_port:
+                continue
+
+            host = socket.inet_ntoa(packet[12:16])
+            if ack != (self._sequence(host, source_port) + 1) & 0xffffffff:
+                continue
+
+            if flags & TCP_SYN and flags & TCP_ACK:
+                results.setdefault((host, source_port), 'open')
+            elif flags & TCP_RST:
+                results.setdefault((host, source_port), 'closed')
+
+    def _send(self, sock, probes, budget, stage):
+        """إرسال حزم SYN على دفعات مع ضبط المعدل"""
+        for start in range(0, len(probes), self.batch_size):
+            if budget is not None and budget.expired():
+                return
+            batch = probes[start:start + self.batch_size]
+            started = time.monotonic()
+
+            for host, port in batch:
+                try:
+                    sock.sendto(self._packet(host, port), (host, 0))
+                except OSError:
+                    # مضيف غير قابل للتوجيه أو امتلاء مخزن الإرسال: يُعامل كمنفذ بلا رد
+                    pass
+
+            if stage:
+                budget.done(stage, len(batch))
+
+            delay = len(batch) / self.rate - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+    def scan(self, probes, budget=None, stage=None):
+        """فحص أزواج (المضيف، المنفذ) وإرجاع {(المضيف، المنفذ): 'open' أو 'closed'}
+
+        المنافذ التي لم يصل منها رد بعد إعادة المحاولات (مفلترة) لا تظهر في النتيجة.
+        """
+        probes = list(probes)
+        results = {}
+        if stage:
+            budget.plan(stage, len(probes))
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+        sock.settimeout(0.2)
+        stop = threading.Event()
+        receiver = threading.Thread(target=self._receive, args=(sock, results, stop), name="ScanSayer-SynReceiver", daemon=True)
+        receiver.start()
+
+        try:
+            for attempt in range(self.retries + 1):
+                outstanding = [probe for probe in probes if probe not in results]
+                if not outstanding:
+                    break
+
+                # إعادة المحاولات لا تُحتسب مرة أخرى في التغطية
+                self._send(sock, outstanding, budget, stage if attempt == 0 else None)
+
+                # انتظار الردود المتأخرة قبل إعادة الإرسال
+                wait = self.timeout if budget is None else budget.timeout(self.timeout, minimum=0)
+                time.sleep(wait)
+                if budget is not None and budget.expired():
+                    break
+        finally:
+            stop.set()
+            receiver.join()
+            sock.close()
+
+        return results
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة استئناف جلسات TLS وتخزين بيانات الشهادات لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import hashlib
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from cryptography import x509
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    """مقبس TLS يحفظ جلسته عند الإغلاق ليُعاد استخدامها لاحقًا"""
+
+    def _real_close(self):
+        # تذاكر جلسات TLS 1.3 تصل بعد المصافحة، لذا تُحفظ الجلسة مرة أخرى هنا
+        cache = getattr(self.context, 'session_cache', None)
+        key = getattr(self, '_resume_key', None)
+        if cache is not None and key is not None and self._sslobj is not None:
+            try:
+                cache.store_session(key, self.session)
+            except (ssl.SSLError, ValueError):
+                pass
+        super()._real_close()
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """سياق TLS يستأنف الجلسات السابقة لكل host:port ويلتقط الشهادة مرة واحدة"""
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        key = None
+        cache = getattr(self, 'session_cache', None)
+        if cache is not None and not server_side:
+            peer = sock.getpeername()
+            key = (server_hostname or peer[0], peer[1])
+            if session is None:
+                session = cache.get_session(key)
+
+        ssl_sock = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session
+        )
+
+        if key is not None:
+            ssl_sock._resume_key = key
+            if do_handshake_on_connect:
+                cache.remember(key, ssl_sock)
+        return ssl_sock
+
+
+class TLSCache:
+    """ذاكرة مؤقتة مشتركة لجلسات TLS وبيانات شهادات النقاط الطرفية"""
+
+    def __init__(self, max_sessions=10000, certificate_ttl=3600):
+        self.max_sessions = max_sessions
+        self.certificate_ttl = certificate_ttl
+        self._sessions = OrderedDict()
+        self._certificates = {}
+        self._lock = threading.Lock()
+        self._context = None
+
+    @property
+    def context(self):
+        """سياق TLS مشترك بدون تحقق من الشهادات (مثل verify=False)"""
+        if self._context is None:
+            with self._lock:
+                if self._context is None:
+                    context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                    context.session_cache = self
+                    self._context = context
+        return self._context
+
+    def get_session(self, key):
+        """الحصول على جلسة سابقة صالحة للاستئناف"""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return None
+            if session.time + session.timeout < time.time():
+                del self._sessions[key]
+                return None
+            self._sessions.move_to_end(key)
+            return session
+
+    def store_session(self, key, session):
+        """تخزين جلسة مع حد أقصى لعدد الجلسات (الأقدم استخدامًا يُحذف أولاً)"""
+        if session is None or (not session.has_ticket and not session.id):
+            return
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def remember(self, key, ssl_sock):
+        """حفظ الجلسة وبيانات الشهادة بعد اكتمال المصافحة"""
+        self.store_session(key, ssl_sock.session)
+
+        with self._lock:
+            cached = self._certificates.get(key)
+            if cached and cached[0] > time.monotonic():
+                return
+
+        certificate = None
+        der = ssl_sock.getpeercert(binary_form=True)
+        if der:
+            certificate = parse_certificate(der)
+
+        with self._lock:
+            self._certificates[key] = (time.monotonic() + self.certificate_ttl, certificate)
+
+    def certificate(self, host, port):
+        """بيانات شهادة النقطة الطرفية المخزنة (أو None)"""
+        with self._lock:
+            cached = self._certificates.get((host, port))
+        return cached[1] if cached else None
+
+    def clear(self):
+        """مسح جميع الجلسات والشهادات المخزنة"""
+        with self._lock:
+            self._sessions.clear()
+            self._certificates.clear()
+
+
+def _name_to_text(name):
+    """تحويل اسم X.509 إلى نص مقروء"""
+    try:
+        return name.rfc4514_string()
+    except ValueError:
+        return ''
+
+
+def parse_certificate(der):
+    """استخراج بيانات الشهادة الأساسية من صيغة DER"""
+    try:
+        cert = x509.load_der_x509_certificate(der)
+    except ValueError:
+        return None
+
+    sans = []
+    try:
+        extension = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        sans.extend(extension.get_values_for_type(x509.DNSName))
+        sans.extend(str(address) for address in extension.get_values_for_type(x509.IPAddress))
+    except x509.ExtensionNotFound:
+        pass
+
+    # الإصدارات الحديثة من cryptography توفر قيمًا مرتبطة بالمنطقة الزمنية
+    not_before = getattr(cert, 'not_valid_before_utc', None) or cert.not_valid_before.replace(tzinfo=timezone.utc)
+    not_after = getattr(cert, 'not_valid_after_utc', None) or cert.not_valid_after.replace(tzinfo=timezone.utc)
+
+    return {
+        'subject': _name_to_text(cert.subject),
+        'issuer': _name_to_text(cert.issuer),
+        'sans': sans,
+        'not_before': not_before.isoformat(),
+        'not_after': not_after.isoformat(),
+        'expired': not_after < datetime.now(timezone.utc),
+        'self_signed': cert.subject == cert.issuer,
+        'fingerprint_sha256': hashlib.sha256(der).hexdigest()
+    }
+
+
+# ذاكرة مشتركة بين جميع الوحدات وبين مهام الخادم
+tls_cache = TLSCache()
@@ -10,103 +10,187 @@
 import requests
 import socket
 import re
+import time
+import uuid
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
-import smb.SMBConnection
-from rich.console import Console
+from rich.markup import escape
 
-# تهيئة وحدة الطباعة الغنية
-console = Console()
+from .connection_pool import RateLimitedHTTP, create_session, http_pool, smb_pool
+from .events import FindingEvent
+from .output import console
+from .path_enum import PathEnumerator, WORDPRESS_PLUGINS, WORDPRESS_THEMES
+from .port_store import PortStore
+from .profiler import tracer, traced
+from .scheduler import ScanBudget, run_prioritized
 
 # إعداد وكيل المستخدم العشوائي
 ua = UserAgent()
 
-class WordPressScanner:
-    """فاحص ثغرات WordPress"""
+# إضافات WordPress ذات الثغرات المعروفة: اسم المجلد -> (اسم الإضافة، وصف الثغرة)
+VULNERABLE_WORDPRESS_PLUGINS = {
+    'templateinvaders': ('TemplateInvaders', 'ثغرة رفع الملفات التعسفي - Arbitrary File Upload')
+}
+
+# بيانات الاعتماد الافتراضية لأجهزة Zyxel بترتيب شيوعها
+ZYXEL_DEFAULT_CREDENTIALS = [
+    {'username': 'admin', 'password': '1234'},
+    {'username': 'admin', 'password': 'admin'},
+    {'username': 'admin', 'password': 'password'},
+    {'username': 'supervisor', 'password': 'supervisor'}
+]
+
+# عبارات تدل على فشل تسجيل الدخول في النص الظاهر للصفحة المعادة (لا كلمات مفردة مثل
+# fail التي تظهر في لوحات الإدارة نفسها: failover و onFailure)
+_LOGIN_FAILURE = re.compile(
+    r'\b(?:log\s*-?\s*in|log\s*on|sign\s*-?\s*in|authentication|authorization)\s+(?:has\s+|was\s+)?failed\b'
+    r'|\bfailed\s+to\s+(?:log\s*-?\s*in|log\s*on|sign\s*-?\s*in|authenticate)\b'
+    r'|\b(?:incorrect|invalid|wrong|bad)\s+(?:user\s*-?\s*name|password|credentials?|login|account)'
+    r'|\b(?:user\s*-?\s*name|password)\s+(?:is\s+)?(?:incorrect|invalid|wrong)\b'
+    r'|\baccess\s+denied\b|\baccount\s+(?:is\s+|has\s+been\s+)?locked\b'
+    r'|\btoo\s+many\s+(?:failed\s+)?(?:login\s+)?attempts\b',
+    re.I
+)
+
+class BaseScanner:
+    """الأساس المشترك للفاحصات: الإعدادات وتسجيل النتائج وإرسالها كأحداث"""
+    
+    # اسم الفحص في أحداث FindingEvent ومفتاح النتائج في التقرير
+    check = None
     
-    def __init__(self, target, verbose=False):
+    def __init__(self, target, verbose=False, budget=None, http=None, on_event=None):
         self.target = target
         self.verbose = verbose
+        self.budget = budget or ScanBudget()
+        self.http = http or http_pool
+        self.on_event = on_event
         self.results = []
     
+    def _add_result(self, result):
+        """تسجيل نتيجة وإرسالها فور اكتشافها"""
+        self.results.append(result)
+        self.emit_result(result)
+    
+    def emit_result(self, result):
+        """إرسال نتيجة كحدث FindingEvent (تُستخدم أيضًا للنتائج المعممة بعد إزالة التكرار)"""
+        if self.on_event:
+            self.on_event(FindingEvent.from_result(self.check, result))
+
+
+class WordPressScanner(BaseScanner):
+    """فاحص ثغرات WordPress"""
+    
+    check = 'wordpress'
+    
+    def __init__(self, target, verbose=False, budget=None, plugins=None, themes=None, http=None, on_event=None):
+        super().__init__(target, verbose, budget, http, on_event)
+        # الإضافات ذات الثغرات المعروفة تُفحص دائمًا حتى مع قائمة كلمات مخصصة
+        self.plugins = list(dict.fromkeys(list(VULNERABLE_WORDPRESS_PLUGINS) + list(plugins or WORDPRESS_PLUGINS)))
+        self.themes = list(themes or WORDPRESS_THEMES)
+        self.enumerator = PathEnumerator(budget=self.budget, http=self.http)
+    
+    @traced('WordPressScanner.scan', 'scanner')
     def scan(self, web_services):
         """فحص ثغرات WordPress TemplateInvaders"""
         console.print("\n[bold blue]فحص ثغرات WordPress TemplateInvaders...[/bold blue]")
         
         wp_detected = False
         
-        # التحقق من وجود WordPress
-        for web_service in web_services:
+        self.budget.plan('wordpress', len(web_services))
+        
+        # التحقق من وجود WordPress (المضيفون ذوو الثغرات السابقة أولاً)
+        for web_service in sorted(web_services, key=lambda service: self.budget.host_priority(service.get('host'))):
+            if self.budget.expired():
+                break
+            
             url = web_service['url']
             try:
                 # التحقق من وجود /wp-login.php
                 wp_login_url = f"{url}/wp-login.php"
                 headers = {'User-Agent': ua.random}
-                response = requests.get(wp_login_url, headers=headers, timeout=10, verify=False)
+                with tracer.span('WordPressScanner.detect', 'probe', url=url):
+                    response = self.http.get(wp_login_url, headers=headers, timeout=self.budget.timeout(10), verify=False)
                 
                 if response.status_code == 200 and 'WordPress' in response.text:
                     wp_detected = True
                     console.print(f"  [yellow]WordPress تم اكتشافه على {url}[/yellow]")
                     
-                    # فحص وجود ثغرة TemplateInvaders
-                    self._check_templateinvaders_vulnerability(url)
+                    # تعداد الإضافات والقوالب ومطابقتها مع الثغرات المعروفة
+                    self._enumerate_components(url)
             except requests.exceptions.RequestException:
                 pass
+            
+            self.budget.done('wordpress')
         
         if not wp_detected and self.verbose:
             console.print("  [blue]لم يتم اكتشاف WordPress على الهدف[/blue]")
         
         return self.results
     
-    def _check_templateinvaders_vulnerability(self, url):
-        """فحص ثغرة TemplateInvaders - Arbitrary File Upload"""
-        try:
-            headers = {'User-Agent': ua.random}
+    @traced('WordPressScanner._enumerate_components', args=('url',))
+    def _enumerate_components(self, url):
+        """تعداد الإضافات والقوالب المثبتة ثم فحص الإضافات ذات الثغرات المعروفة"""
+        plugins = self.enumerator.enumerate(url, 'wp-content/plugins', self.plugins, 'wordpress_plugins')
+        themes = self.enumerator.enumerate(url, 'wp-content/themes', self.themes, 'wordpress_themes')
+        
+        for directory in ('wp-content/plugins', 'wp-content/themes'):
+            if (url, directory) in self.enumerator.unreliable:
+                console.print(f"  [yellow]الخادم {url} يجيب على جميع المسارات تحت /{directory}، تم إيقاف التعداد[/yellow]")
+        
+        if self.verbose and (plugins or themes):
+            console.print(f"    [blue]الإضافات: {', '.join(item['name'] for item in plugins) or '-'}[/blue]")
+            console.print(f"    [blue]القوالب: {', '.join(item['name'] for item in themes) or '-'}[/blue]")
+        
+        self._add_result({
+            'url': url,
+            'plugins': [item['name'] for item in plugins],
+            'themes': [item['name'] for item in themes],
+            'vulnerable': False
+        })
+        
+        for plugin in plugins:
+            known = VULNERABLE_WORDPRESS_PLUGINS.get(plugin['name'])
+            if not known:
+                continue
             
-            # التحقق من وجود البلاجن
-            ti_plugin_url = f"{url}/wp-content/plugins/templateinvaders/"
-            ti_response = requests.get(ti_plugin_url, headers=headers, timeout=10, verify=False)
+            test_result = {
+                'url': url,
+                'plugin': known[0],
+                'vulnerable': True,
+                'details': known[1]
+            }
             
-            if ti_response.status_code == 200:
-                # فحص إمكانية رفع الملفات
-                upload_url = f"{url}/wp-content/plugins/templateinvaders/ti_uploading.php"
-                
-                # محاكاة محاولة رفع ملف (بدون رفع فعلي للملفات الضارة)
-                test_result = {
-                    'url': url,
-                    'plugin': 'TemplateInvaders',
-                    'vulnerable': True,
-                    'details': 'ثغرة رفع الملفات التعسفي - Arbitrary File Upload'
-                }
-                
-                self.results.append(test_result)
-                console.print(f"  [bold red]ثغرة: {test_result['details']} في {url}[/bold red]")
-        except requests.exceptions.RequestException:
-            pass
+            self._add_result(test_result)
+            console.print(f"  [bold red]ثغرة: {test_result['details']} في {url}[/bold red]")
 
 
-class CraftCMSScanner:
+class CraftCMSScanner(BaseScanner):
     """فاحص ثغرات Craft CMS"""
     
-    def __init__(self, target, verbose=False):
-        self.target = target
-        self.verbose = verbose
-        self.results = []
+    check = 'craftcms'
     
+    @traced('CraftCMSScanner.scan', 'scanner')
     def scan(self, web_services):
         """فحص ثغرات Craft CMS"""
         console.print("\n[bold blue]فحص ثغرات Craft CMS...[/bold blue]")
         
         craft_detected = False
         
-        # التحقق من وجود Craft CMS
-        for web_service in web_services:
+        self.budget.plan('craftcms', len(web_services))
+        
+        # التحقق من وجود Craft CMS (المضيفون ذوو الثغرات السابقة أولاً)
+        for web_service in sorted(web_services, key=lambda service: self.budget.host_priority(service.get('host'))):
+            if self.budget.expired():
+                break
+            
             url = web_service['url']
             try:
                 # التحقق من وجود /admin/login
                 craft_login_url = f"{url}/admin/login"
                 headers = {'User-Agent': ua.random}
-                response = requests.get(craft_login_url, headers=headers, timeout=10, verify=False)
+                with tracer.span('CraftCMSScanner.detect', 'probe', url=url):
+                    response = self.http.get(craft_login_url, headers=headers, timeout=self.budget.timeout(10), verify=False)
                 
                 if response.status_code == 200 and ('Craft CMS' in response.text or 'Craft' in response.text):
                     craft_detected = True
@@ -116,12 +200,15 @@ class CraftCMSScanner:
                     self._check_rce_vulnerability(url, response.text)
             except requests.exceptions.RequestException:
                 pass
+            
+            self.budget.done('craftcms')
         
         if not craft_detected and self.verbose:
             console.print("  [blue]لم يتم اكتشاف Craft CMS على الهدف[/blue]")
         
         return self.results
     
+    @traced('CraftCMSScanner._check_rce_vulnerability', 'parse', args=('url',))
     def _check_rce_vulnerability(self, url, html):
         """فحص ثغرة RCE في Craft CMS"""
         craft_version = self._extract_craft_version(html)
@@ -134,8 +221,8 @@ class CraftCMSScanner:
                 'details': 'ثغرة تنفيذ الأوامر عن بعد - Remote Code Execution'
             }
             
-            self.results.append(test_result)
-            console.print(f"  [bold red]ثغرة: {test_result['details']} في {url} (الإصدار {craft_version})[/bold red]")
+            self._add_result(test_result)
+            console.print(f"  [bold red]ثغرة: {test_result['details']} في {url} (الإصدار {escape(craft_version)})[/bold red]")
     
     def _extract_craft_version(self, html):
         """استخراج إصدار Craft CMS من HTML"""
@@ -150,62 +237,86 @@ class CraftCMSScanner:
             return None
 
 
-class SMBScanner:
+class SMBScanner(BaseScanner):
     """فاحص ثغرات SMB"""
     
-    def __init__(self, target, verbose=False):
-        self.target = target
-        self.verbose = verbose
-        self.results = []
+    check = 'smb'
     
-    def scan(self, open_ports):
+    @traced('SMBScanner.scan', 'scanner')
+    def scan(self, ports):
         """فحص ثغرات SMB - Anonymous Write Access"""
         console.print("\n[bold blue]فحص ثغرات SMB - Anonymous Write Access...[/bold blue]")
         
-        # التحقق من وجود منفذ SMB مفتوح
-        smb_ports = [139, 445]
-        smb_open = False
-        
-        for port_info in open_ports:
-            if port_info['port'] in smb_ports and port_info['state'] == 'open':
-                smb_open = True
-                break
+        # المضيفون الذين لديهم منفذ SMB مفتوح (445 مفضل على 139)
+        smb_hosts = self._find_smb_hosts(ports)
         
-        if not smb_open:
+        if not smb_hosts:
             if self.verbose:
                 console.print("  [blue]لم يتم اكتشاف منافذ SMB مفتوحة على الهدف[/blue]")
             return self.results
         
-        # محاولة الاتصال بـ SMB بدون مصادقة
+        self.budget.plan('smb', len(smb_hosts))
+        
+        for host in sorted(smb_hosts, key=self.budget.host_priority):
+            if self.budget.expired():
+                break
+            self._scan_host(host, smb_hosts[host])
+            self.budget.done('smb')
+        
+        return self.results
+    
+    def _find_smb_hosts(self, ports):
+        """استخراج المضيفين ومنفذ SMB المفتوح لكل منهم من مخزن المنافذ"""
+        smb_hosts = {}
+        
+        if isinstance(ports, PortStore):
+            for port in (139, 445):
+                for host in ports.hosts_with_port(port):
+                    smb_hosts[host] = port
+        else:
+            # قائمة منافذ بالتنسيق القديم للهدف نفسه
+            for port_info in sorted(ports, key=lambda info: info['port']):
+                if port_info['port'] in (139, 445) and port_info['state'] == 'open':
+                    smb_hosts[self.target] = port_info['port']
+        
+        return smb_hosts
+    
+    def _scan_host(self, host, port):
+        """محاولة الاتصال بـ SMB بدون مصادقة على مضيف واحد"""
         try:
-            conn = smb.SMBConnection.SMBConnection('', '', 'ScanSayer', self.target, use_ntlm_v2=True)
-            if conn.connect(self.target, 445, timeout=10):
-                console.print(f"  [yellow]تم الاتصال بـ SMB على {self.target}[/yellow]")
+            with tracer.span('SMBScanner.connect', 'probe', host=host):
+                conn = smb_pool.acquire(host, port, timeout=self.budget.timeout(10))
+            if conn:
+                console.print(f"  [yellow]تم الاتصال بـ SMB على {host}[/yellow]")
                 
                 # محاولة الوصول إلى المشاركات المتاحة
-                shares = conn.listShares()
+                with tracer.span('SMBScanner.listShares', 'probe', host=host):
+                    shares = conn.listShares()
                 for share in shares:
                     if not share.isSpecial and share.name not in ['ADMIN$', 'C$', 'IPC$']:
                         try:
                             # محاولة الكتابة (بدون كتابة فعلية)
                             if self._check_smb_write_access(conn, share.name):
                                 test_result = {
-                                    'host': self.target,
+                                    'host': host,
+                                    'port': port,
                                     'share': share.name,
                                     'vulnerable': True,
                                     'details': 'ثغرة الوصول الكتابي المجهول - Anonymous Write Access'
                                 }
                                 
-                                self.results.append(test_result)
-                                console.print(f"  [bold red]ثغرة: {test_result['details']} في المشاركة {share.name}[/bold red]")
+                                self._add_result(test_result)
+                                console.print(f"  [bold red]ثغرة: {test_result['details']} في المشاركة {escape(share.name)} على {host}[/bold red]")
                         except:
                             pass
+                
+                # إعادة الاتصال إلى المجمع لاستخدامه في الفحوصات اللاحقة
+                smb_pool.release(host, conn, port)
         except Exception as e:
             if self.verbose:
-                console.print(f"  [blue]خطأ في الاتصال بـ SMB: {str(e)}[/blue]")
-        
-        return self.results
+                console.print(f"  [blue]خطأ في الاتصال بـ SMB على {host}: {str(e)}[/blue]")
     
+    @traced('SMBScanner._check_smb_write_access', args=('share_name',))
     def _check_smb_write_access(self, conn, share_name):
         """التحقق من إمكانية الكتابة على مشاركة SMB"""
         try:
@@ -216,56 +327,188 @@ class SMBScanner:
             return False
 
 
-class ZyxelScanner:
+class ZyxelScanner(BaseScanner):
     """فاحص ثغرات Zyxel"""
     
-    def __init__(self, target, verbose=False):
-        self.target = target
-        self.verbose = verbose
-        self.results = []
+    check = 'zyxel'
     
+    def __init__(self, target, verbose=False, budget=None, http=None, on_event=None, threads=50, attempt_delay=1.0):
+        super().__init__(target, verbose, budget, http, on_event)
+        self.threads = threads
+        # المهلة بين محاولتين على الجهاز نفسه لتجنب قفل الحساب
+        self.attempt_delay = attempt_delay
+    
+    @traced('ZyxelScanner.scan', 'scanner')
     def scan(self, web_services):
         """فحص ثغرات Zyxel - Default credentials"""
         console.print("\n[bold blue]فحص ثغرات Zyxel - Default credentials...[/bold blue]")
         
-        zyxel_detected = False
+        # التعرف على واجهات Zyxel من بيانات خدمات الويب المكتشفة
+        devices = [
+            web_service for web_service in web_services
+            if 'zyxel' in (web_service.get('server') or '').lower() or 'zyxel' in (web_service.get('title') or '').lower()
+        ]
         
-        # التحقق من وجود واجهة Zyxel
-        for web_service in web_services:
-            url = web_service['url']
-            server = web_service.get('server', '').lower()
-            title = web_service.get('title', '').lower()
-            
-            if 'zyxel' in server or 'zyxel' in title:
-                zyxel_detected = True
-                console.print(f"  [yellow]جهاز Zyxel تم اكتشافه على {url}[/yellow]")
-                
-                # فحص بيانات الاعتماد الافتراضية
-                self._check_default_credentials(url)
+        if not devices:
+            if self.verbose:
+                console.print("  [blue]لم يتم اكتشاف أجهزة Zyxel على الهدف[/blue]")
+            return self.results
+        
+        for web_service in devices:
+            console.print(f"  [yellow]جهاز Zyxel تم اكتشافه على {web_service['url']}[/yellow]")
         
-        if not zyxel_detected and self.verbose:
-            console.print("  [blue]لم يتم اكتشاف أجهزة Zyxel على الهدف[/blue]")
+        # فحص الأجهزة بالتوازي (المضيفون ذوو الثغرات السابقة أولاً)، والمحاولات على كل جهاز متتابعة
+        devices.sort(key=lambda service: self.budget.host_priority(service.get('host')))
+        checks = [(web_service['url'],) for web_service in devices]
+        for (url,), _, error in run_prioritized(self._check_default_credentials, checks, self.threads, self.budget, 'zyxel'):
+            if error and self.verbose:
+                console.print(f"  [blue]خطأ في فحص بيانات الاعتماد على {url}: {str(error)}[/blue]")
         
         return self.results
     
+    def _new_session(self):
+        """جلسة keep-alive مستقلة لكل جهاز حتى لا تختلط ملفات تعريف الارتباط بين الأجهزة"""
+        session = create_session(pool_size=1)
+        # الحفاظ على محدد المعدل إن كان عميل HTTP المحقون يستخدمه
+        limiter = getattr(self.http, 'limiter', None)
+        return RateLimitedHTTP(session, limiter) if limiter else session
+    
+    @traced('ZyxelScanner._check_default_credentials', args=('url',))
     def _check_default_credentials(self, url):
-        """فحص بيانات الاعتماد الافتراضية لأجهزة Zyxel"""
-        # هذا مجرد فحص وليس استغلال فعلي للثغرة
-        default_creds = [
-            {'username': 'admin', 'password': '1234'},
-            {'username': 'admin', 'password': 'admin'},
-            {'username': 'admin', 'password': 'password'},
-            {'username': 'supervisor', 'password': 'supervisor'}
-        ]
+        """تجربة بيانات الاعتماد الافتراضية على جهاز واحد والتوقف عند أول نجاح"""
+        session = self._new_session()
+        headers = {'User-Agent': ua.random}
+        try:
+            login = self._find_login(session, url, headers)
+            if login is None:
+                if self.verbose:
+                    console.print(f"  [blue]لم يتم العثور على نموذج تسجيل دخول في {url}[/blue]")
+                return None
+            
+            # محاولة ضابطة بكلمة مرور عشوائية خاطئة: الأجهزة التي ترد على كل محاولة بالصفحة
+            # نفسها (مثل إعادة توجيه بسكربت إلى صفحة الدخول) لا تُحتسب فيها أي بيانات اعتماد ناجحة
+            with tracer.span('ZyxelScanner.login', 'probe', url=url):
+                wrong = {'username': ZYXEL_DEFAULT_CREDENTIALS[0]['username'], 'password': uuid.uuid4().hex}
+                _, control = self._try_login(session, login, wrong, headers)
+            
+            for credentials in ZYXEL_DEFAULT_CREDENTIALS:
+                time.sleep(self.budget.timeout(self.attempt_delay, minimum=0))
+                if self.budget.expired():
+                    return None
+                
+                with tracer.span('ZyxelScanner.login', 'probe', url=url):
+                    looks_successful, signature = self._try_login(session, login, credentials, headers)
+                
+                if looks_successful and self._differs_from_control(signature, control):
+                    test_result = {
+                        'url': url,
+                        'device': 'Zyxel',
+                        'vulnerable': True,
+                        'details': 'بيانات اعتماد افتراضية - Default credentials',
+                        'credentials': dict(credentials),
+                        'auth': login['method']
+                    }
+                    
+                    self._add_result(test_result)
+                    console.print(f"  [bold red]ثغرة: {test_result['details']} في {url} ({credentials['username']}/{credentials['password']})[/bold red]")
+                    return credentials
+            
+            if self.verbose:
+                console.print(f"  [green]بيانات الاعتماد الافتراضية غير صالحة على {url}[/green]")
+            return None
+        except requests.exceptions.RequestException as e:
+            if self.verbose:
+                console.print(f"  [blue]خطأ في الاتصال بـ {url}: {str(e)}[/blue]")
+            return None
+        finally:
+            session.close()
+    
+    def _find_login(self, session, url, headers):
+        """تحديد طريقة تسجيل الدخول: مصادقة HTTP Basic أو نموذج HTML يحتوي على حقل كلمة مرور"""
+        response = session.get(url, headers=headers, timeout=self.budget.timeout(10), verify=False)
         
-        # محاكاة فحص بيانات الاعتماد (بدون محاولة تسجيل دخول فعلية)
-        test_result = {
-            'url': url,
-            'device': 'Zyxel',
-            'vulnerable': True,
-            'details': 'بيانات اعتماد افتراضية - Default credentials',
-            'credentials': default_creds[0]  # للتوضيح فقط
-        }
+        if response.status_code == 401 and 'basic' in response.headers.get('WWW-Authenticate', '').lower():
+            return {'method': 'basic', 'url': url}
+        
+        soup = BeautifulSoup(response.text, 'html.parser')
+        for form in soup.find_all('form'):
+            password = form.find('input', attrs={'type': re.compile('^password$', re.I)})
+            if password is None or not password.get('name'):
+                continue
+            
+            username = form.find('input', attrs={'type': re.compile('^(text|email)$', re.I)}) or \
+                form.find('input', attrs={'name': re.compile('user|name|login', re.I)})
+            hidden = {
+                field.get('name'): field.get('value', '')
+                for field in form.find_all('input', attrs={'type': re.compile('^hidden$', re.I)})
+                if field.get('name')
+            }
+            
+            return {
+                'method': 'form',
+                'url': urljoin(response.url, form.get('action') or response.url),
+                'verb': (form.get('method') or 'post').upper(),
+                'username_field': username.get('name') if username is not None else None,
+                'password_field': password.get('name'),
+                'fields': hidden
+            }
+        
+        return None
+    
+    def _try_login(self, session, login, credentials, headers):
+        """محاولة تسجيل دخول واحدة وإرجاع (هل يبدو الدخول ناجحًا، ملامح الرد)"""
+        timeout = self.budget.timeout(10)
+        
+        if login['method'] == 'basic':
+            response = session.get(login['url'], headers=headers, timeout=timeout, verify=False,
+                                   auth=(credentials['username'], credentials['password']))
+            # أي رد خطأ (404، 500، 502...) بعد إرسال البيانات لا يعني دخولاً ناجحًا
+            return 200 <= response.status_code < 400, self._login_signature(response)
+        
+        data = dict(login['fields'])
+        if login['username_field']:
+            data[login['username_field']] = credentials['username']
+        data[login['password_field']] = credentials['password']
+        
+        if login['verb'] == 'GET':
+            response = session.get(login['url'], params=data, headers=headers, timeout=timeout, verify=False)
+        else:
+            response = session.request('POST', login['url'], data=data, headers=headers, timeout=timeout, verify=False)
+        
+        return self._looks_logged_in(response), self._login_signature(response)
+    
+    def _looks_logged_in(self, response):
+        """هل يبدو رد النموذج صفحة بعد الدخول لا صفحة خطأ أو صفحة الدخول نفسها"""
+        # الفشل يعيد عادة صفحة الدخول نفسها أو رسالة خطأ، والنجاح يعرض لوحة الإدارة
+        if response.status_code >= 400:
+            return False
+        text = response.text
+        if re.search(r'<input[^>]+type=["\']?password', text, re.I):
+            return False
+        
+        # البحث في النص الظاهر فقط حتى لا تُطابق أسماء الدوال والمتغيرات في السكربتات
+        soup = BeautifulSoup(text, 'html.parser')
+        for element in soup(['script', 'style']):
+            element.decompose()
+        return not _LOGIN_FAILURE.search(soup.get_text(' '))
+    
+    def _login_signature(self, response):
+        """ملامح رد تسجيل الدخول المستخدمة في المقارنة مع المحاولة الضابطة"""
+        cookies = set()
+        for step in (*response.history, response):
+            cookies.update(cookie.name for cookie in step.cookies)
         
-        self.results.append(test_result)
-        console.print(f"  [bold red]ثغرة: {test_result['details']} في {url}[/bold red]")
\ No newline at end of file
+        return {
+            'status': response.status_code,
+            'url': response.url,
+            'redirects': tuple(step.headers.get('Location', '') for step in response.history),
+            'cookies': frozenset(cookies),
+            'length': len(response.content)
+        }
+    
+    def _differs_from_control(self, signature, control):
+        """هل يختلف الرد بوضوح عن رد كلمة المرور الخاطئة (الحالة، الرابط، التوجيه، الكعكات، الحجم)"""
+        if any(signature[key] != control[key] for key in ('status', 'url', 'redirects', 'cookies')):
+            return True
+        # الرموز المتغيرة (مثل CSRF) تغير الحجم قليلاً فقط، أما لوحة الإدارة فتختلف كثيرًا عن صفحة الخطأ
+        return abs(signature['length'] - control['length']) > max(64, control['length'] // 10)
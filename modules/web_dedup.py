@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+وحدة إزالة تكرار خدمات الويب المتطابقة لـ ScanSayer
+المطور: Saudi Linux
+البريد الإلكتروني: SayerLinux@gmail.com
+"""
+
+import hashlib
+import random
+from collections import OrderedDict
+
+from .output import console
+
+# الترويسات التي تميز التطبيق أو الجهاز دون أن تتغير بين الطلبات
+FINGERPRINT_HEADERS = ['Server', 'X-Powered-By', 'Content-Type', 'WWW-Authenticate', 'X-Generator']
+
+# الحقول الخاصة بكل خدمة والتي لا تدخل في مقارنة النتائج
+_LOCATION_FIELDS = ('url', 'host', 'propagated_from')
+
+
+def fingerprint_response(response):
+    """بصمة الاستجابة: تجزئة المحتوى مع الترويسات المميزة وأسماء ملفات تعريف الارتباط"""
+    digest = hashlib.sha256(response.content)
+
+    for header in FINGERPRINT_HEADERS:
+        digest.update(f"\n{header}:{response.headers.get(header, '')}".encode('utf-8', 'replace'))
+
+    # أسماء ملفات تعريف الارتباط ثابتة للتطبيق، أما قيمها فتتغير مع كل طلب
+    cookie_names = sorted(cookie.name for cookie in response.cookies)
+    digest.update(f"\nCookies:{','.join(cookie_names)}".encode('utf-8', 'replace'))
+
+    return digest.hexdigest()
+
+
+class WebServiceGroups:
+    """تجميع خدمات الويب حسب البصمة واختيار ممثل لكل مجموعة"""
+
+    def __init__(self, web_services):
+        self.groups = OrderedDict()
+        for web_service in web_services:
+            # الخدمات بدون بصمة تبقى في مجموعة مستقلة
+            key = web_service.get('fingerprint') or web_service['url']
+            self.groups.setdefault(key, []).append(web_service)
+
+    @property
+    def representatives(self):
+        """أول خدمة في كل مجموعة"""
+        return [members[0] for members in self.groups.values()]
+
+    def sample(self, rate):
+        """اختيار عينة من الأعضاء غير الممثلين للتحقق من صحة التعميم"""
+        samples = {}
+        if rate <= 0:
+            return samples
+
+        for key, members in self.groups.items():
+            others = members[1:]
+            if others:
+                count = min(len(others), max(1, round(len(others) * rate)))
+                samples[key] = random.sample(others, count)
+        return samples
+
+
+def _verdict(results):
+    """تلخيص النتائج بعد حذف حقول الموقع لمقارنتها بين أعضاء المجموعة"""
+    return sorted(
+        repr(sorted((k, v) for k, v in result.items() if k not in _LOCATION_FIELDS))
+        for result in results
+    )
+
+
+def scan_deduplicated(scanner, web_services, verify_rate=0.0, verbose=False):
+    """تشغيل الفاحص على ممثل واحد لكل مجموعة متطابقة وتعميم النتيجة على بقية الأعضاء
+
+    عند تحديد verify_rate يُفحص جزء عشوائي من الأعضاء أيضًا، وإذا اختلفت نتيجته
+    عن نتيجة الممثل تُفحص المجموعة كاملة بدل التعميم.
+    """
+    groups = WebServiceGroups(web_services)
+    samples = groups.sample(verify_rate)
+
+    to_scan = groups.representatives + [member for members in samples.values() for member in members]
+    scanned_urls = {web_service['url'] for web_service in to_scan}
+    results = list(scanner.scan(to_scan))
+
+    if verbose and len(to_scan) < len(web_services):
+        console.print(f"  [blue]تم فحص {len(to_scan)} من أصل {len(web_services)} خدمة ويب بعد تجميع الخدمات المتطابقة[/blue]")
+
+    by_url = {}
+    for result in results:
+        by_url.setdefault(result.get('url'), []).append(result)
+
+    # المجموعات التي اختلفت عيناتها عن ممثلها تُفحص بالكامل
+    mismatched = []
+    for key, members in samples.items():
+        expected = _verdict(by_url.get(groups.groups[key][0]['url'], []))
+        if any(_verdict(by_url.get(member['url'], [])) != expected for member in members):
+            mismatched.append(key)
+
+    if mismatched:
+        remaining = [
+            member for key in mismatched for member in groups.groups[key]
+            if member['url'] not in scanned_urls
+        ]
+        if verbose:
+            console.print(f"  [yellow]نتائج مختلفة داخل {len(mismatched)} مجموعة، سيتم فحص {len(remaining)} خدمة إضافية[/yellow]")
+        # الفاحص يراكم نتائجه، لذا تحتوي القائمة المعادة على نتائج المرحلتين
+        results = list(scanner.scan(remaining))
+        scanned_urls.update(member['url'] for member in remaining)
+        by_url = {}
+        for result in results:
+            by_url.setdefault(result.get('url'), []).append(result)
+
+    # نسخ نتيجة الممثل إلى الأعضاء الذين لم يُفحصوا
+    propagated = []
+    for members in groups.groups.values():
+        representative = members[0]
+        for member in members[1:]:
+            if member['url'] in scanned_urls:
+                continue
+            for result in by_url.get(representative['url'], []):
+                copy = dict(result)
+                copy['url'] = member['url']
+                copy['propagated_from'] = representative['url']
+                propagated.append(copy)
+                scanner.emit_result(copy)
+
+    return results + propagated
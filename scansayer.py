@@ -13,32 +13,47 @@ import os
 import time
 from datetime import datetime
 from colorama import init
-from rich.console import Console
-from rich.progress import Progress
 
 # استيراد الوحدات الخاصة بالأداة
-from modules.asset_discovery import AssetDiscovery
-from modules.vulnerability_scanners import (
-    WordPressScanner,
-    CraftCMSScanner,
-    SMBScanner,
-    ZyxelScanner
-)
+from modules.api import ScanPipeline
 from modules.report_generator import ReportGenerator
+from modules.output import console
+from modules.profiler import tracer, CPUSampler
+from modules.scan_service import ScanService
+from modules.scheduler import ScanBudget, load_priority_hosts
+from modules.path_enum import load_wordlist
+from modules.report_tools import FindingSet, diff_reports
 
 # تهيئة الألوان
 init(autoreset=True)
-console = Console()
 
 # الإصدار الحالي
 VERSION = "1.0.0"
 
 class ScanSayer:
-    def __init__(self, target, output=None, verbose=False, threads=10):
+    def __init__(self, target, output=None, verbose=False, threads=10, profile=None, profile_sample=False,
+                 cancel_event=None, on_stage=None, show_progress=True, reverse_dns=False,
+                 dedup=True, dedup_verify=0.0, time_budget=None, priority_hosts=(), syn_scan=False,
+                 wp_plugins=None, wp_themes=None, allow_target_file=False):
         self.target = target
         self.output = output
         self.verbose = verbose
         self.threads = threads
+        self.profile = profile
+        self.profile_sample = profile_sample
+        self.cancel_event = cancel_event
+        self.on_stage = on_stage
+        self.show_progress = show_progress
+        self.reverse_dns = reverse_dns
+        self.dedup = dedup
+        self.dedup_verify = dedup_verify
+        self.time_budget = time_budget
+        self.priority_hosts = priority_hosts
+        self.syn_scan = syn_scan
+        self.wp_plugins = wp_plugins
+        self.wp_themes = wp_themes
+        self.allow_target_file = allow_target_file
+        self.budget = None
         self.results = {}
         self.start_time = time.time()
         self.scan_count = 0
@@ -47,63 +62,136 @@ class ScanSayer:
         
     def run(self):
         """تشغيل جميع الفحوصات"""
-        with Progress() as progress:
-            task = progress.add_task("[cyan]جاري الفحص...", total=6)
-            
-            # 1. اكتشاف الأصول
-            asset_discovery = AssetDiscovery(self.target, self.threads, self.verbose)
-            discovery_results = asset_discovery.discover()
-            self.results['hosts'] = discovery_results['hosts']
-            self.results['ports'] = discovery_results['ports']
-            self.results['web_services'] = discovery_results['web_services']
-            self.scan_count += 1
-            progress.update(task, advance=1)
-            
-            # 2. فحص ثغرات WordPress
-            wp_scanner = WordPressScanner(self.target, self.verbose)
-            self.results['wordpress'] = wp_scanner.scan(self.results['web_services'])
-            self.scan_count += 1
-            progress.update(task, advance=1)
-            
-            # 3. فحص ثغرات Craft CMS
-            craft_scanner = CraftCMSScanner(self.target, self.verbose)
-            self.results['craftcms'] = craft_scanner.scan(self.results['web_services'])
-            self.scan_count += 1
-            progress.update(task, advance=1)
-            
-            # 4. فحص ثغرات SMB
-            smb_scanner = SMBScanner(self.target, self.verbose)
-            # استخدام قائمة المنافذ المفتوحة للهدف الأول (في حالة وجود أكثر من هدف)
-            first_host = self.results['hosts'][0] if self.results['hosts'] else self.target
-            open_ports = self.results['ports'].get(first_host, [])
-            self.results['smb'] = smb_scanner.scan(open_ports)
-            self.scan_count += 1
-            progress.update(task, advance=1)
-            
-            # 5. فحص ثغرات Zyxel
-            zyxel_scanner = ZyxelScanner(self.target, self.verbose)
-            self.results['zyxel'] = zyxel_scanner.scan(self.results['web_services'])
-            self.scan_count += 1
-            progress.update(task, advance=1)
+        if not self.profile:
+            return self._run_stages()
+        
+        # تفعيل وضع قياس الأداء
+        tracer.enable()
+        sampler = CPUSampler() if self.profile_sample else None
+        if sampler:
+            sampler.start()
+        
+        try:
+            with tracer.span('ScanSayer.run', 'stage', target=self.target):
+                return self._run_stages()
+        finally:
+            tracer.disable()
+            tracer.save(self.profile)
+            if sampler:
+                sampler.stop()
+                sampler.save(os.path.splitext(self.profile)[0] + '.folded')
+    
+    def _run_stages(self):
+        """تنفيذ مراحل الفحص بالتتابع ثم إنشاء التقرير"""
+        # المهلة الزمنية تبدأ مع أول مرحلة، وطلب الإلغاء يوقف الفحوصات الجارية أيضًا
+        self.budget = ScanBudget(self.time_budget, self.cancel_event, self.priority_hosts)
+        pipeline = ScanPipeline(
+            self.target, self.threads, self.verbose, self.budget,
+            reverse_dns=self.reverse_dns,
+            syn_scan=self.syn_scan,
+            dedup=self.dedup,
+            dedup_verify=self.dedup_verify,
+            wp_plugins=self.wp_plugins,
+            wp_themes=self.wp_themes,
+            allow_target_file=self.allow_target_file,
+            on_stage=self._finish_stage
+        )
+        self.results = pipeline.results
+        
+        # شريط التقدم يتابع عدادات كل مرحلة في ScanBudget بدل عدد المراحل الثابت
+        if self.show_progress:
+            console.track(self.budget)
+        
+        try:
+            # 1-5. اكتشاف الأصول وفحص الثغرات
+            pipeline.run()
             
-            # 6. إنشاء التقرير
-            scan_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            duration = time.time() - self.start_time
-            report_generator = ReportGenerator(self.target, self.results, scan_time, duration)
-            report_generator.display_console_report()
+            # 6. إنشاء التقرير (جزئي إذا انتهت المهلة قبل اكتمال المراحل)
+            with tracer.span('report', 'stage'):
+                scan_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                duration = time.time() - self.start_time
+                report_generator = ReportGenerator(self.target, self.results, scan_time, duration)
+                report_generator.display_console_report()
             
-            # حفظ التقارير إذا تم تحديد ملف الإخراج
-            if self.output:
-                # حفظ تقرير JSON
-                report_generator.save_json_report(self.output)
+                # حفظ التقارير إذا تم تحديد ملف الإخراج
+                if self.output:
+                    # حفظ تقرير JSON
+                    report_generator.save_json_report(self.output)
                 
-                # حفظ تقرير HTML
-                html_output = os.path.splitext(self.output)[0] + '.html'
-                report_generator.save_html_report(html_output)
-            
-            progress.update(task, advance=1)
-            
+                    # حفظ تقرير HTML
+                    html_output = os.path.splitext(self.output)[0] + '.html'
+                    report_generator.save_html_report(html_output)
+        finally:
+            console.untrack()
+        
         return self.results
+    
+    def _finish_stage(self, stage, data):
+        """إبلاغ المستمع بعد انتهاء مرحلة"""
+        self.scan_count += 1
+        if self.on_stage:
+            self.on_stage(stage, data)
+
+
+def run_job(job):
+    """تنفيذ مهمة فحص واحدة ضمن وضع الخادم"""
+    scanner = ScanSayer(
+        target=job.target,
+        threads=job.threads,
+        cancel_event=job.cancel_event,
+        on_stage=job.add_event,
+        show_progress=False
+    )
+    return scanner.run()
+
+
+def _save_reports(report_generator, output):
+    """حفظ تقرير JSON و HTML بجانبه"""
+    report_generator.save_json_report(output)
+    report_generator.save_html_report(os.path.splitext(output)[0] + '.html')
+
+
+def report_main(argv):
+    """الأمر الفرعي report: دمج تقارير JSON أو مقارنتها دون إعادة الفحص"""
+    parser = argparse.ArgumentParser(prog='scansayer.py report', description='دمج تقارير ScanSayer ومقارنتها')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+    
+    merge_parser = subparsers.add_parser('merge', help='دمج عدة تقارير في تقرير واحد دون تكرار النتائج')
+    merge_parser.add_argument('reports', nargs='+', metavar='REPORT', help='ملفات تقارير JSON')
+    merge_parser.add_argument('-o', '--output', help='ملف لحفظ التقرير المدمج (JSON و HTML)')
+    
+    diff_parser = subparsers.add_parser('diff', help='مقارنة تقارير قديمة بتقارير جديدة')
+    diff_parser.add_argument('--old', nargs='+', required=True, metavar='REPORT', help='التقارير القديمة (تُدمج قبل المقارنة)')
+    diff_parser.add_argument('--new', nargs='+', required=True, metavar='REPORT', help='التقارير الجديدة (تُدمج قبل المقارنة)')
+    diff_parser.add_argument('-o', '--output', help='المسار الأساسي لحفظ التقارير: <الاسم>.new.json و .resolved.json و .unchanged.json')
+    
+    args = parser.parse_args(argv)
+    scan_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    start = time.time()
+    
+    if args.action == 'merge':
+        findings = FindingSet(args.reports)
+        console.print(f"[bold green]تم دمج {len(args.reports)} تقرير: {len(findings)} ثغرة مميزة[/bold green]")
+        report_generator = ReportGenerator(', '.join(findings.targets), findings.to_results(), scan_time, time.time() - start)
+        report_generator.display_console_report()
+        if args.output:
+            _save_reports(report_generator, args.output)
+        return
+    
+    diff, old, new = diff_reports(args.old, args.new)
+    target = ', '.join(dict.fromkeys(old.targets + new.targets))
+    duration = time.time() - start
+    labels = {'new': 'ثغرات جديدة', 'resolved': 'ثغرات تم إصلاحها', 'unchanged': 'ثغرات مستمرة'}
+    
+    for category, results in diff.items():
+        report_generator = ReportGenerator(f"{target} - {labels[category]}", results, scan_time, duration)
+        console.print(f"[bold]{labels[category]}:[/bold] {report_generator.vuln_count}")
+        # الثغرات المستمرة تُعرض كعدد فقط، وتفاصيلها في الملف المحفوظ
+        if category != 'unchanged' and report_generator.vuln_count:
+            report_generator.display_console_report()
+        if args.output:
+            base = os.path.splitext(args.output)[0]
+            _save_reports(report_generator, f"{base}.{category}.json")
 
 
 def print_banner():
@@ -123,29 +211,79 @@ def print_banner():
 
 def main():
     """الدالة الرئيسية"""
-    print_banner()
+    # الأمر الفرعي لدمج التقارير ومقارنتها
+    if len(sys.argv) > 1 and sys.argv[1] == 'report':
+        print_banner()
+        try:
+            report_main(sys.argv[2:])
+        except (OSError, ValueError) as e:
+            console.print(f"\n[bold red]خطأ: {str(e)}[/bold red]")
+            sys.exit(1)
+        return
     
     # إعداد محلل الوسائط
     parser = argparse.ArgumentParser(description='ScanSayer - ماسح أمني آلي مفتوح المصدر')
-    parser.add_argument('-t', '--target', required=True, help='الهدف للفحص (IP, نطاق CIDR, أو اسم المضيف)')
+    parser.add_argument('-t', '--target', help='الهدف للفحص (IP, نطاق CIDR, أو اسم المضيف، أو عدة أهداف مفصولة بفواصل، أو @ملف)')
     parser.add_argument('-o', '--output', help='ملف لحفظ النتائج (JSON)')
     parser.add_argument('-v', '--verbose', action='store_true', help='عرض معلومات مفصلة')
+    parser.add_argument('-q', '--quiet', action='store_true', help='عدم عرض أي مخرجات على الطرفية (التقارير تُحفظ في الملفات فقط)')
     parser.add_argument('--threads', type=int, default=10, help='عدد مسارات التنفيذ المتوازية (الافتراضي: 10)')
+    parser.add_argument('--reverse-dns', action='store_true', help='البحث العكسي (PTR) عن أسماء عناوين IP المستهدفة')
+    parser.add_argument('--syn-scan', action='store_true', help='فحص المنافذ بحزم SYN نصف مفتوحة عبر مقبس خام (يتطلب صلاحيات root، IPv4 فقط)')
+    parser.add_argument('--no-dedup', action='store_true', help='فحص كل خدمة ويب على حدة بدل تجميع الخدمات المتطابقة')
+    parser.add_argument('--dedup-verify', type=float, default=0.0, metavar='RATE',
+                        help='نسبة أعضاء كل مجموعة متطابقة التي تُفحص للتحقق من صحة تعميم النتيجة (0-1، الافتراضي: 0)')
+    parser.add_argument('--wp-plugins', metavar='WORDLIST', help='ملف قائمة أسماء إضافات WordPress للتعداد (سطر لكل إضافة)')
+    parser.add_argument('--wp-themes', metavar='WORDLIST', help='ملف قائمة أسماء قوالب WordPress للتعداد (سطر لكل قالب)')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help='الحد الأقصى لمدة الفحص بالثواني؛ تُفحص الأهداف الأخطر أولاً ويُنشأ تقرير جزئي عند انتهاء المهلة')
+    parser.add_argument('--prior-report', metavar='JSON_FILE', help='تقرير JSON سابق لإعطاء الأولوية للمضيفين الذين ظهرت لديهم ثغرات')
+    parser.add_argument('--profile', metavar='TRACE_FILE', help='تسجيل خط زمني للأداء بتنسيق Chrome Trace/Perfetto في الملف المحدد')
+    parser.add_argument('--profile-sample', action='store_true', help='أخذ عينات دورية من مكدسات CPU مع --profile (ملف .folded)')
+    parser.add_argument('--serve', metavar='HOST:PORT', nargs='?', const='127.0.0.1:8765',
+                        help='تشغيل الأداة كخادم بواجهة HTTP لإدارة مهام الفحص (الافتراضي: 127.0.0.1:8765)')
+    parser.add_argument('--workers', type=int, default=4, help='عدد مهام الفحص المتزامنة في وضع الخادم (الافتراضي: 4)')
+    parser.add_argument('--max-threads', type=int, default=50,
+                        help='الحد الأعلى لعدد خيوط كل مهمة في وضع الخادم (الافتراضي: 50)')
     parser.add_argument('--version', action='version', version=f'ScanSayer v{VERSION}')
     
     args = parser.parse_args()
     
+    # الوضع الصامت يتخطى العرض كليًا، بما في ذلك الشعار
+    console.quiet = args.quiet
+    print_banner()
+    
+    if not args.target and not args.serve:
+        parser.error('يجب تحديد الهدف باستخدام -t/--target أو تشغيل وضع الخادم باستخدام --serve')
+    
     try:
         # تجاهل تحذيرات SSL
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
+        # وضع الخادم
+        if args.serve:
+            host, _, port = args.serve.rpartition(':')
+            ScanService(run_job, workers=args.workers, max_threads=args.max_threads).serve(host or '127.0.0.1', int(port))
+            return
+        
         # بدء الفحص
         scanner = ScanSayer(
             target=args.target,
             output=args.output,
             verbose=args.verbose,
-            threads=args.threads
+            threads=args.threads,
+            reverse_dns=args.reverse_dns,
+            syn_scan=args.syn_scan,
+            wp_plugins=load_wordlist(args.wp_plugins) if args.wp_plugins else None,
+            wp_themes=load_wordlist(args.wp_themes) if args.wp_themes else None,
+            dedup=not args.no_dedup,
+            dedup_verify=args.dedup_verify,
+            time_budget=args.time_budget,
+            priority_hosts=load_priority_hosts(args.prior_report) if args.prior_report else (),
+            profile=args.profile,
+            profile_sample=args.profile_sample,
+            allow_target_file=True
         )
         scanner.run()
     except KeyboardInterrupt: